@@ -3,30 +3,71 @@ OSINT API Endpoints
 Provides real OSINT intelligence for email and phone numbers.
 """
 
-from fastapi import APIRouter, HTTPException
+import io
+import math
+import itertools
+import asyncio
+import logging
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, List
-from dataclasses import asdict
+from typing import AsyncIterator, Awaitable, Callable, Optional, List, TypeVar
+from dataclasses import asdict, is_dataclass
 
 from ...services.email_osint import get_email_osint_service
+from ...services.bulk_upload import detect_format, parse_column
+from ...services.email_triage import get_email_triage_service, summarize
 from ...services.phone_osint import get_phone_osint_service
+from ...services.phone_batch import get_phone_batch_service
+from ...services.phone_metadata import get_phone_metadata_cache
+from ...services.scan_cache import get_scan_result_cache
+from ...services.scan_checkpoint import get_scan_checkpoint_store
+from ...services.job_queue import JobContext, get_scan_job_queue
+from ...services.site_catalog import ScanScope, get_site_catalog, EMAIL_CATALOG, USERNAME_CATALOG
 from app.api import deps
 from app.models.user import User as UserModel
 from app.models.osint import OsintLog
+from app.models.scan_job import ScanJob
+from app.core.config import settings
+from app.core.database import SessionLocal
 from fastapi import Depends
 from sqlalchemy.orm import Session
 import json
 
 router = APIRouter()
 
+T = TypeVar("T")
 
-class EmailRequest(BaseModel):
+# Non-standard "client closed request" status, only ever seen in our own logs
+CLIENT_CLOSED_REQUEST = 499
+
+
+class ScopedScanRequest(BaseModel):
+    # Optional scan scope, resolved against the site catalog before any request is sent
+    include_categories: Optional[List[str]] = None
+    exclude_categories: Optional[List[str]] = None
+    sites: Optional[List[str]] = None  # explicit site allow-list (names)
+    force_refresh: bool = False  # bypass the result cache and run a fresh scan
+
+
+class EmailRequest(ScopedScanRequest):
     email: str
-    deep_scan: bool = False  # Quick scan (16 sites) or Deep scan (757+ sites)
+    deep_scan: bool = False  # Quick scan (email sites + curated username sites) or Deep scan (full catalogs)
+    background: bool = False  # return a job id right away, poll GET /jobs/{job_id}
+    extract_metadata: bool = True  # names/avatars from hit responses; turn off for the fastest scans
+
+
+class UsernameRequest(ScopedScanRequest):
+    username: str
+
+
+class ResumeRequest(BaseModel):
+    checkpoint_id: str
 
 
 class PhoneRequest(BaseModel):
     phone: str
+    background: bool = False  # return a job id right away, poll GET /jobs/{job_id}
 
 
 # Response models
@@ -44,6 +85,8 @@ class SocialProfileResponse(BaseModel):
     exists: bool = False
     category: str = "unknown"
     icon: str = "globe"
+    sources: List[str] = []
+    metadata: Optional[dict] = None
 
 
 class GravatarResponse(BaseModel):
@@ -51,16 +94,17 @@ class GravatarResponse(BaseModel):
     hash: str
     display_name: Optional[str] = None
     profile_url: Optional[str] = None
+    photos: List[str] = []
 
 
 class EmailOsintResponse(BaseModel):
     email: str
-    valid: bool = False
+    valid: Optional[bool] = False
     format_valid: bool = False
-    mx_valid: bool = False
+    mx_valid: Optional[bool] = False  # null: MX lookup cut off by the deadline
     disposable: bool = False
     free_provider: bool = False
-    deliverable: bool = False
+    deliverable: Optional[bool] = False
     
     # Breach data
     breached: bool = False
@@ -74,6 +118,22 @@ class EmailOsintResponse(BaseModel):
     # Social profiles
     social_profiles: List[SocialProfileResponse] = []
     social_count: int = 0
+    
+    # Coverage
+    sites_checked: int = 0
+    sites_skipped: List[str] = []  # open circuit breaker
+    sites_failed: List[str] = []  # rate limited or request error
+    sites_timed_out: List[str] = []
+    cached: bool = False  # served from the scan result cache
+    
+    scan_mode: str = "quick"
+    elapsed_seconds: float = 0.0
+    
+    # Deadline hit: sites_pending were not checked, resume with POST /email/resume
+    partial: bool = False
+    sites_pending: List[str] = []
+    sites_pending_keys: List[str] = []  # "catalog:name" of each pending site
+    checkpoint_id: Optional[str] = None
 
 
 class PhoneOsintResponse(BaseModel):
@@ -107,9 +167,427 @@ class PhoneOsintResponse(BaseModel):
     international_format: str = ""
 
 
+def _known_categories() -> set:
+    return set(get_site_catalog(USERNAME_CATALOG).categories) | set(get_site_catalog(EMAIL_CATALOG).categories)
+
+
+def _scope_from_request(request: ScopedScanRequest) -> ScanScope:
+    """Build the scan scope, rejecting category names the catalogs don't know."""
+    unknown = set(request.include_categories or []) | set(request.exclude_categories or [])
+    unknown -= _known_categories()
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(sorted(unknown))}")
+    return ScanScope.build(request.include_categories, request.exclude_categories, request.sites)
+
+
+def _email_response_data(result) -> dict:
+    """Convert an EmailOsintResult dataclass to the response dict."""
+    return {
+        "email": result.email,
+        "valid": result.valid,
+        "format_valid": result.format_valid,
+        "mx_valid": result.mx_valid,
+        "disposable": result.disposable,
+        "free_provider": result.free_provider,
+        "deliverable": result.deliverable,
+        "breached": result.breached,
+        "breach_count": result.breach_count,
+        "breaches": [
+            {
+                "name": b.name,
+                "domain": b.domain,
+                "date": b.date,
+                "data_types": b.data_types
+            }
+            for b in result.breaches
+        ],
+        "gravatar": {
+            "url": result.gravatar.url,
+            "hash": result.gravatar.hash,
+            "display_name": result.gravatar.display_name,
+            "profile_url": result.gravatar.profile_url,
+            "photos": result.gravatar.photos
+        } if result.gravatar else None,
+        "gravatar_url": result.gravatar_url,
+        "social_profiles": [
+            {
+                "platform": p.platform,
+                "url": p.url,
+                "username": p.username,
+                "exists": p.exists,
+                "category": p.category,
+                "icon": p.icon,
+                "sources": p.sources,
+                "metadata": p.metadata
+            }
+            for p in result.social_profiles
+        ],
+        "social_count": result.social_count,
+        "sites_checked": result.sites_checked,
+        "sites_skipped": result.sites_skipped,
+        "sites_failed": result.sites_failed,
+        "sites_timed_out": result.sites_timed_out,
+        "partial": result.partial,
+        "sites_pending": result.sites_pending,
+        "sites_pending_keys": result.sites_pending_keys,
+        "scan_mode": result.scan_mode,
+        "elapsed_seconds": result.elapsed_seconds
+    }
+
+
+def _username_response_data(result) -> dict:
+    """Convert a UsernameScanResult dataclass to the response dict."""
+    return {
+        "username": result.username,
+        "social_profiles": [asdict(p) for p in result.social_profiles],
+        "social_count": result.social_count,
+        "sites_checked": result.sites_checked,
+        "sites_skipped": result.sites_skipped,
+        "sites_failed": result.sites_failed,
+        "sites_timed_out": result.sites_timed_out,
+        "partial": result.partial,
+        "sites_pending": result.sites_pending,
+        "sites_pending_keys": result.sites_pending_keys
+    }
+
+
+def _phone_response_data(result) -> dict:
+    """Convert a PhoneOsintResult dataclass to the response dict."""
+    return {
+        "phone": result.phone,
+        "formatted": result.formatted,
+        "valid": result.valid,
+        "possible": result.possible,
+        "name": result.name,
+        "profile_image": result.profile_image,
+        "country_code": result.country_code,
+        "country_name": result.country_name,
+        "region": result.region,
+        "timezone": result.timezone,
+        "carrier": result.carrier,
+        "line_type": result.line_type,
+        "whatsapp": result.whatsapp,
+        "telegram": result.telegram,
+        "signal": result.signal,
+        "viber": result.viber,
+        "national_number": result.national_number,
+        "international_format": result.international_format
+    }
+
+
+def _job_response_data(job: ScanJob) -> dict:
+    """Status, partial and final results of a background scan job."""
+    return {
+        "job_id": job.id,
+        "module": job.module,
+        "query": job.query,
+        "status": job.status,
+        "attempts": job.attempts,
+        "partial": json.loads(job.partial) if job.partial else None,
+        "result": json.loads(job.result) if job.result else None,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None
+    }
+
+
+def _charge_and_log(user_id: int, module: str, query: str, response_data: dict, tokens: int = 1):
+    """
+    Deduct tokens and log the scan in a session of its own.
+    Streaming responses outlive the request-scoped session, so they bill here.
+    """
+    db = SessionLocal()
+    try:
+        user = db.query(UserModel).filter(UserModel.id == user_id).first()
+        user.token_balance -= tokens
+        db.add(user)
+        db.add(OsintLog(
+            user_id=user_id,
+            module=module,
+            query=query,
+            tokens_used=tokens,
+            result=json.dumps(response_data)
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _reserve_and_log(user_id: int, module: str, query: str, response_data: dict, tokens: int) -> bool:
+    """
+    Deduct tokens up front and log the scan, in one transaction; False (and
+    nothing written) when the balance is too low. For bulk streams, whose
+    rows are worth paying for before the last one is sent.
+    """
+    db = SessionLocal()
+    try:
+        # Conditional update, so concurrent batches can't overdraw the balance
+        charged = db.query(UserModel).filter(UserModel.id == user_id, UserModel.token_balance >= tokens).update(
+            {"token_balance": UserModel.token_balance - tokens}, synchronize_session=False
+        )
+        if not charged:
+            db.rollback()
+            return False
+        db.add(OsintLog(
+            user_id=user_id,
+            module=module,
+            query=query,
+            tokens_used=tokens,
+            result=json.dumps(response_data)
+        ))
+        db.commit()
+        return True
+    finally:
+        db.close()
+
+
+def _refund(user_id: int, tokens: int):
+    """Give back tokens reserved for a bulk stream that failed server-side."""
+    db = SessionLocal()
+    try:
+        db.query(UserModel).filter(UserModel.id == user_id).update(
+            {"token_balance": UserModel.token_balance + tokens}, synchronize_session=False
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def _until_disconnect(http_request: Request, scan: Awaitable[T]) -> Optional[T]:
+    """
+    Await a scan while watching the client connection.
+    If the client goes away the scan is cancelled (down to its site checks and
+    CLI subprocess) and None is returned.
+    """
+    task = asyncio.ensure_future(scan)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=settings.DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                logging.info(f"[OSINT] Client disconnected, cancelling {http_request.url.path}")
+                return None
+    finally:
+        if not task.done():
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+def _cache_ttl(response_data: dict) -> Optional[float]:
+    """
+    How long a scan response may be cached: the full TTL with complete
+    coverage, a short one when the only gaps are breaker-skipped sites and a
+    few timed-out / failed checks, 0 (not cached) for partial or gappier scans.
+    """
+    if response_data.get("partial"):
+        return 0
+    misses = len(response_data.get("sites_timed_out", [])) + len(response_data.get("sites_failed", []))
+    if misses > settings.SCAN_CACHE_MAX_MISSES:
+        return 0
+    if misses or response_data.get("sites_skipped"):
+        return settings.SCAN_CACHE_GAPPED_TTL_SECONDS
+    return None
+
+
+async def _cache_response(key: str, response_data: dict):
+    """Cache a finished scan response for as long as its coverage allows."""
+    ttl = _cache_ttl(response_data)
+    if ttl != 0:
+        await get_scan_result_cache().set(key, response_data, ttl=ttl)
+
+
+def _email_mode(deep_scan: bool, extract_metadata: bool) -> str:
+    """Scan mode part of an email cache key."""
+    return ("deep" if deep_scan else "quick") + ("" if extract_metadata else "-nometa")
+
+
+async def _save_checkpoint(
+    user_id: int, email: str, deep_scan: bool, extract_metadata: bool, scope: ScanScope, response_data: dict
+) -> str:
+    """Keep a partial email scan so POST /email/resume can finish only its pending sites."""
+    return await get_scan_checkpoint_store().save(user_id, {
+        "email": email,
+        "deep_scan": deep_scan,
+        "extract_metadata": extract_metadata,
+        "include_categories": list(scope.include_categories) if scope.include_categories is not None else None,
+        "exclude_categories": list(scope.exclude_categories),
+        "sites": list(scope.sites) if scope.sites is not None else None,
+        "response": response_data
+    })
+
+
+def _merge_resumed(previous: dict, resumed: dict) -> dict:
+    """Combine a partial email scan with the scan of its pending sites."""
+    merged = {**previous, "cached": False}
+    merged.pop("checkpoint_id", None)
+    
+    profiles = {p["url"]: dict(p, sources=list(p["sources"])) for p in previous["social_profiles"]}
+    for profile in resumed["social_profiles"]:
+        if profile["url"] in profiles:
+            sources = profiles[profile["url"]]["sources"]
+            sources.extend(s for s in profile["sources"] if s not in sources)
+        else:
+            profiles[profile["url"]] = profile
+    merged["social_profiles"] = list(profiles.values())
+    merged["social_count"] = len([p for p in merged["social_profiles"] if p["exists"]])
+    
+    merged["sites_checked"] = previous["sites_checked"] + resumed["sites_checked"]
+    merged["sites_skipped"] = previous["sites_skipped"] + resumed["sites_skipped"]
+    merged["sites_failed"] = previous.get("sites_failed", []) + resumed["sites_failed"]
+    merged["sites_timed_out"] = previous["sites_timed_out"] + resumed["sites_timed_out"]
+    merged["partial"] = resumed["partial"]
+    merged["sites_pending"] = resumed["sites_pending"]
+    merged["sites_pending_keys"] = resumed["sites_pending_keys"]
+    merged["elapsed_seconds"] = round(previous["elapsed_seconds"] + resumed["elapsed_seconds"], 3)
+    
+    # MX may have been cut off by the first deadline
+    merged["mx_valid"] = previous["mx_valid"] if resumed["mx_valid"] is None else resumed["mx_valid"]
+    merged["valid"] = merged["format_valid"] and merged["mx_valid"]
+    merged["deliverable"] = merged["valid"] and not merged["disposable"]
+    if merged["gravatar"] is None and resumed["gravatar"] is not None:
+        merged["gravatar"] = resumed["gravatar"]
+        merged["gravatar_url"] = resumed["gravatar_url"]
+    return merged
+
+
+async def _email_scan(
+    email: str, deep_scan: bool, scope: ScanScope, force_refresh: bool = False,
+    on_partial: Optional[Callable[[dict], Awaitable[None]]] = None, extract_metadata: bool = True
+) -> dict:
+    """
+    Cache-aware email scan returning the response dict.
+    With on_partial the scan is streamed and the profiles found so far are
+    reported on every progress event.
+    """
+    cache = get_scan_result_cache()
+    cache_key = cache.key("email", email, _email_mode(deep_scan, extract_metadata), scope)
+    cached = None if force_refresh else await cache.get(cache_key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    service = get_email_osint_service()
+    if on_partial is None:
+        result = await service.investigate(
+            email, deep_scan=deep_scan, scope=scope, extract_metadata=extract_metadata
+        )
+    else:
+        profiles = []
+        async for event in service.investigate_stream(
+            email, deep_scan=deep_scan, scope=scope, extract_metadata=extract_metadata
+        ):
+            if event["event"] == "profile":
+                profiles.append(asdict(event["data"]))
+            elif event["event"] == "progress":
+                await on_partial({**event["data"], "social_profiles": profiles})
+            elif event["event"] == "summary":
+                result = event["data"]
+
+    response_data = _email_response_data(result)
+    await _cache_response(cache_key, response_data)
+    return {**response_data, "cached": False}
+
+
+async def _run_email_job(job: JobContext) -> dict:
+    params = job.params
+    scope = ScanScope.build(params.get("include_categories"), params.get("exclude_categories"), params.get("sites"))
+    return await _email_scan(
+        job.query, params.get("deep_scan", False), scope, params.get("force_refresh", False),
+        on_partial=job.report_partial, extract_metadata=params.get("extract_metadata", True)
+    )
+
+
+async def _run_phone_job(job: JobContext) -> dict:
+    result = await get_phone_osint_service().investigate(job.query)
+    return _phone_response_data(result)
+
+
+get_scan_job_queue().register("email", _run_email_job)
+get_scan_job_queue().register("phone", _run_phone_job)
+
+
+def _sse(event: str, data) -> str:
+    """Format one Server-Sent Events frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _sse_stream(
+    events: AsyncIterator[dict], on_summary: Callable[[object], Awaitable[dict]]
+) -> AsyncIterator[str]:
+    """
+    Relay service events as SSE frames.
+    A producer task feeds a queue so keepalive comments can be sent while no
+    site check has resolved, which keeps idle timeouts from cutting the stream.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+    
+    async def produce():
+        try:
+            async for event in events:
+                await queue.put(event)
+        except Exception as e:
+            await queue.put({"event": "error", "data": {"error": str(e)}})
+        finally:
+            await queue.put(None)
+    
+    producer = asyncio.ensure_future(produce())
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.STREAM_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            if event is None:
+                break
+            
+            data = event["data"]
+            if event["event"] == "summary":
+                data = await on_summary(data)
+            elif is_dataclass(data):
+                data = asdict(data)
+            yield _sse(event["event"], data)
+    finally:
+        # Client gone or stream done: cancel the scan and wait for its checks to wind down
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+async def _cached_stream(response_data: dict, on_summary: Callable[[dict], Awaitable[dict]]) -> AsyncIterator[str]:
+    """Replay a cached result with the same events a live scan emits."""
+    yield _sse("start", {
+        "query": response_data.get("email") or response_data.get("username"),
+        "total": response_data.get("sites_checked", 0),
+        "deduplicated": 0,
+        "cached": True
+    })
+    for profile in response_data.get("social_profiles", []):
+        yield _sse("profile", profile)
+    yield _sse("summary", await on_summary(response_data))
+
+
+def _event_stream_response(stream: AsyncIterator[str]) -> StreamingResponse:
+    """Wrap an SSE frame iterator, disabling proxy buffering."""
+    return StreamingResponse(
+        stream,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/categories")
+async def list_categories():
+    """
+    Site categories usable in include_categories / exclude_categories.
+    """
+    return {"success": True, "data": sorted(_known_categories())}
+
+
 @router.post("/email")
 async def scan_email(
     request: EmailRequest,
+    http_request: Request,
     current_user: UserModel = Depends(deps.get_current_user),
     db: Session = Depends(deps.get_db)
 ):
@@ -119,50 +597,31 @@ async def scan_email(
     if current_user.token_balance < 1:
         raise HTTPException(status_code=402, detail="Insufficient tokens")
 
+    scope = _scope_from_request(request)
+
+    if request.background:
+        job = get_scan_job_queue().submit(
+            db, current_user.id, "email", request.email,
+            request.model_dump(exclude={"email", "background"})
+        )
+        if job is None:
+            raise HTTPException(status_code=402, detail="Insufficient tokens")
+        return {"success": True, "data": _job_response_data(job)}
+
     try:
-        service = get_email_osint_service()
-        result = await service.investigate(request.email, deep_scan=request.deep_scan)
-        
-        # Convert dataclass to dict for response
-        response_data = {
-            "email": result.email,
-            "valid": result.valid,
-            "format_valid": result.format_valid,
-            "mx_valid": result.mx_valid,
-            "disposable": result.disposable,
-            "free_provider": result.free_provider,
-            "deliverable": result.deliverable,
-            "breached": result.breached,
-            "breach_count": result.breach_count,
-            "breaches": [
-                {
-                    "name": b.name,
-                    "domain": b.domain,
-                    "date": b.date,
-                    "data_types": b.data_types
-                }
-                for b in result.breaches
-            ],
-            "gravatar": {
-                "url": result.gravatar.url,
-                "hash": result.gravatar.hash,
-                "display_name": result.gravatar.display_name,
-                "profile_url": result.gravatar.profile_url
-            } if result.gravatar else None,
-            "gravatar_url": result.gravatar_url,
-            "social_profiles": [
-                {
-                    "platform": p.platform,
-                    "url": p.url,
-                    "username": p.username,
-                    "exists": p.exists,
-                    "category": p.category,
-                    "icon": p.icon
-                }
-                for p in result.social_profiles
-            ],
-            "social_count": result.social_count
-        }
+        response_data = await _until_disconnect(
+            http_request, _email_scan(
+                request.email, request.deep_scan, scope, request.force_refresh,
+                extract_metadata=request.extract_metadata
+            )
+        )
+        if response_data is None:
+            # Nobody to answer; the scan was abandoned, so it is not billed
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        if response_data["partial"] and response_data["sites_pending"]:
+            response_data["checkpoint_id"] = await _save_checkpoint(
+                current_user.id, request.email, request.deep_scan, request.extract_metadata, scope, response_data
+            )
         
         # Deduct token
         current_user.token_balance -= 1
@@ -190,9 +649,199 @@ async def scan_email(
         }
 
 
+@router.post("/email/resume")
+async def resume_email(
+    request: ResumeRequest,
+    http_request: Request,
+    current_user: UserModel = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Finish a partial email scan by checking only its pending sites.
+    Returns the merged result; the scan was already billed, so this is logged free.
+    """
+    checkpoints = get_scan_checkpoint_store()
+    checkpoint = await checkpoints.load(request.checkpoint_id, current_user.id)
+    if checkpoint is None:
+        raise HTTPException(status_code=404, detail="Checkpoint not found or expired")
+    
+    previous = checkpoint["response"]
+    email, deep_scan, extract_metadata = checkpoint["email"], checkpoint["deep_scan"], checkpoint["extract_metadata"]
+    scope = ScanScope.build(checkpoint["include_categories"], checkpoint["exclude_categories"], checkpoint["sites"])
+    # Pending checks are keyed by catalog and name: a site pending in one catalog is not re-run in the other
+    pending_scope = ScanScope.build(
+        checkpoint["include_categories"], checkpoint["exclude_categories"], checkpoint["sites"],
+        previous["sites_pending_keys"]
+    )
+    
+    try:
+        resumed = await _until_disconnect(
+            http_request,
+            _email_scan(email, deep_scan, pending_scope, force_refresh=True, extract_metadata=extract_metadata)
+        )
+        if resumed is None:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
+        
+        response_data = _merge_resumed(previous, resumed)
+        await checkpoints.delete(request.checkpoint_id)
+        if response_data["partial"] and response_data["sites_pending"]:
+            response_data["checkpoint_id"] = await _save_checkpoint(
+                current_user.id, email, deep_scan, extract_metadata, scope, response_data
+            )
+        else:
+            cache = get_scan_result_cache()
+            await _cache_response(cache.key("email", email, _email_mode(deep_scan, extract_metadata), scope), response_data)
+        
+        db.add(OsintLog(
+            user_id=current_user.id,
+            module="email",
+            query=email,
+            tokens_used=0,
+            result=json.dumps(response_data)
+        ))
+        db.commit()
+        
+        return {
+            "success": True,
+            "data": response_data
+        }
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@router.post("/email/stream")
+async def stream_email(
+    request: EmailRequest,
+    current_user: UserModel = Depends(deps.get_current_user)
+):
+    """
+    Streaming email OSINT scan (Server-Sent Events).
+    Emits "start", one "profile" per hit, "progress" counters and a final
+    "summary" with the same payload as POST /email. Billed on the summary.
+    """
+    if current_user.token_balance < 1:
+        raise HTTPException(status_code=402, detail="Insufficient tokens")
+
+    scope = _scope_from_request(request)
+    user_id = current_user.id
+    cache = get_scan_result_cache()
+    cache_key = cache.key("email", request.email, _email_mode(request.deep_scan, request.extract_metadata), scope)
+    cached = None if request.force_refresh else await cache.get(cache_key)
+
+    async def on_cache_hit(cached_data: dict) -> dict:
+        response_data = {**cached_data, "cached": True}
+        await asyncio.to_thread(_charge_and_log, user_id, "email", request.email, response_data)
+        return response_data
+
+    if cached is not None:
+        return _event_stream_response(_cached_stream(cached, on_cache_hit))
+
+    async def on_summary(result) -> dict:
+        response_data = _email_response_data(result)
+        await _cache_response(cache_key, response_data)
+        response_data = {**response_data, "cached": False}
+        await asyncio.to_thread(_charge_and_log, user_id, "email", request.email, response_data)
+        return response_data
+
+    service = get_email_osint_service()
+    events = service.investigate_stream(
+        request.email, deep_scan=request.deep_scan, scope=scope, extract_metadata=request.extract_metadata
+    )
+    return _event_stream_response(_sse_stream(events, on_summary))
+
+
+@router.post("/username/stream")
+async def stream_username(
+    request: UsernameRequest,
+    current_user: UserModel = Depends(deps.get_current_user)
+):
+    """
+    Streaming username scan (Server-Sent Events), same events as /email/stream.
+    """
+    if current_user.token_balance < 1:
+        raise HTTPException(status_code=402, detail="Insufficient tokens")
+
+    scope = _scope_from_request(request)
+    user_id = current_user.id
+    cache = get_scan_result_cache()
+    cache_key = cache.key("username", request.username, "full", scope)
+    cached = None if request.force_refresh else await cache.get(cache_key)
+
+    async def on_cache_hit(cached_data: dict) -> dict:
+        response_data = {**cached_data, "cached": True}
+        await asyncio.to_thread(_charge_and_log, user_id, "username", request.username, response_data)
+        return response_data
+
+    if cached is not None:
+        return _event_stream_response(_cached_stream(cached, on_cache_hit))
+
+    async def on_summary(result) -> dict:
+        response_data = _username_response_data(result)
+        await _cache_response(cache_key, response_data)
+        response_data = {**response_data, "cached": False}
+        await asyncio.to_thread(_charge_and_log, user_id, "username", request.username, response_data)
+        return response_data
+
+    service = get_email_osint_service()
+    events = service.stream_username(request.username, scope=scope)
+    return _event_stream_response(_sse_stream(events, on_summary))
+
+
+def _read_bulk_upload(file: UploadFile, name: str, limit: int) -> List[str]:
+    """The `name` column of an uploaded list, stopping one past the batch limit."""
+    upload = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        values = parse_column(upload, detect_format(file.filename, file.content_type), name)
+        return list(itertools.islice(values, limit + 1))
+    finally:
+        upload.detach()
+
+
+@router.post("/email/bulk")
+async def triage_emails(
+    file: UploadFile = File(...),
+    current_user: UserModel = Depends(deps.get_current_user)
+):
+    """
+    Bulk email triage: format, disposable / free provider and MX for every
+    address in an uploaded CSV or NDJSON file, without social scans.
+    Streams one NDJSON row per address (with its input position) and a final
+    {"summary": ...} line. Billed per batch before the first row; refunded if
+    the triage itself fails.
+    """
+    emails = await asyncio.to_thread(_read_bulk_upload, file, "email", settings.BULK_EMAIL_MAX_ROWS)
+    if len(emails) > settings.BULK_EMAIL_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_EMAIL_MAX_ROWS} addresses per batch")
+    if not emails:
+        raise HTTPException(status_code=400, detail="No addresses found")
+
+    tokens = math.ceil(len(emails) / settings.BULK_EMAIL_ROWS_PER_TOKEN)
+    user_id = current_user.id
+    query = f"{len(emails)} addresses"
+    if not await asyncio.to_thread(_reserve_and_log, user_id, "email_bulk", query, {"tokens_used": tokens}, tokens):
+        raise HTTPException(status_code=402, detail="Insufficient tokens")
+
+    async def rows() -> AsyncIterator[str]:
+        counts = {}
+        try:
+            async for row in get_email_triage_service().triage(emails):
+                summarize(counts, row)
+                yield json.dumps(asdict(row)) + "\n"
+        except Exception:
+            await asyncio.to_thread(_refund, user_id, tokens)
+            raise
+        yield json.dumps({"summary": {**counts, "tokens_used": tokens}}) + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
 @router.post("/phone")
 async def scan_phone(
     request: PhoneRequest,
+    http_request: Request,
     current_user: UserModel = Depends(deps.get_current_user),
     db: Session = Depends(deps.get_db)
 ):
@@ -202,31 +851,20 @@ async def scan_phone(
     if current_user.token_balance < 1:
         raise HTTPException(status_code=402, detail="Insufficient tokens")
 
+    if request.background:
+        job = get_scan_job_queue().submit(db, current_user.id, "phone", request.phone)
+        if job is None:
+            raise HTTPException(status_code=402, detail="Insufficient tokens")
+        return {"success": True, "data": _job_response_data(job)}
+
     try:
         service = get_phone_osint_service()
-        result = await service.investigate(request.phone)
+        result = await _until_disconnect(http_request, service.investigate(request.phone))
+        if result is None:
+            return Response(status_code=CLIENT_CLOSED_REQUEST)
         
         # Convert dataclass to dict for response
-        response_data = {
-            "phone": result.phone,
-            "formatted": result.formatted,
-            "valid": result.valid,
-            "possible": result.possible,
-            "name": result.name,
-            "profile_image": result.profile_image,
-            "country_code": result.country_code,
-            "country_name": result.country_name,
-            "region": result.region,
-            "timezone": result.timezone,
-            "carrier": result.carrier,
-            "line_type": result.line_type,
-            "whatsapp": result.whatsapp,
-            "telegram": result.telegram,
-            "signal": result.signal,
-            "viber": result.viber,
-            "national_number": result.national_number,
-            "international_format": result.international_format
-        }
+        response_data = _phone_response_data(result)
         
         # Deduct token
         current_user.token_balance -= 1
@@ -252,3 +890,85 @@ async def scan_phone(
             "success": False,
             "error": str(e)
         }
+
+
+@router.get("/phone/metadata-stats")
+async def phone_metadata_stats(current_user: UserModel = Depends(deps.get_current_user)):
+    """
+    Hit rate of this worker's phone metadata prefix cache.
+    """
+    return {"success": True, "data": get_phone_metadata_cache().stats()}
+
+
+@router.post("/phone/bulk")
+async def parse_phones(
+    file: UploadFile = File(...),
+    current_user: UserModel = Depends(deps.get_current_user)
+):
+    """
+    Bulk phone parsing: validity, formats, country, carrier, line type and
+    timezone for every number in an uploaded CSV or NDJSON file, without the
+    messaging-app checks. Streams NDJSON rows in input order and a final
+    {"summary": ...} line. Billed per batch before the first row; refunded if
+    parsing itself fails.
+    """
+    phones = await asyncio.to_thread(_read_bulk_upload, file, "phone", settings.BULK_PHONE_MAX_ROWS)
+    if len(phones) > settings.BULK_PHONE_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.BULK_PHONE_MAX_ROWS} numbers per batch")
+    if not phones:
+        raise HTTPException(status_code=400, detail="No numbers found")
+
+    tokens = math.ceil(len(phones) / settings.BULK_PHONE_ROWS_PER_TOKEN)
+    user_id = current_user.id
+    query = f"{len(phones)} numbers"
+    if not await asyncio.to_thread(_reserve_and_log, user_id, "phone_bulk", query, {"tokens_used": tokens}, tokens):
+        raise HTTPException(status_code=402, detail="Insufficient tokens")
+
+    async def rows() -> AsyncIterator[str]:
+        counts = {"rows": 0, "valid": 0}
+        try:
+            async for row in get_phone_batch_service().parse(phones):
+                counts["rows"] += 1
+                counts["valid"] += row["valid"]
+                yield json.dumps(row) + "\n"
+        except Exception:
+            await asyncio.to_thread(_refund, user_id, tokens)
+            raise
+        yield json.dumps({"summary": {**counts, "tokens_used": tokens}}) + "\n"
+
+    return StreamingResponse(rows(), media_type="application/x-ndjson", headers={"X-Accel-Buffering": "no"})
+
+
+@router.get("/jobs")
+async def list_jobs(
+    limit: int = 20,
+    current_user: UserModel = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    The caller's most recent background scan jobs.
+    """
+    jobs = (
+        db.query(ScanJob)
+        .filter(ScanJob.user_id == current_user.id)
+        .order_by(ScanJob.created_at.desc())
+        .limit(min(max(limit, 1), 100))
+        .all()
+    )
+    return {"success": True, "data": [_job_response_data(job) for job in jobs]}
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    current_user: UserModel = Depends(deps.get_current_user),
+    db: Session = Depends(deps.get_db)
+):
+    """
+    Status of a background scan job, with partial results while it runs
+    and the final response data (same shape as the synchronous endpoint) once done.
+    """
+    job = db.query(ScanJob).filter(ScanJob.id == job_id, ScanJob.user_id == current_user.id).first()
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, "data": _job_response_data(job)}
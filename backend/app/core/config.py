@@ -15,6 +15,86 @@ class Settings(BaseSettings):
     EVA_API_KEY: str = os.getenv("EVA_API_KEY", "")
     BREACH_DIRECTORY_API_KEY: str = os.getenv("BREACH_DIRECTORY_API_KEY", "")
     
+    # Site checks (Blackbird)
+    BLACKBIRD_ENGINE: str = "native"  # native (in-process) or cli (subprocess)
+    SITE_CHECK_TIMEOUT: float = 10.0
+    SITE_CHECK_MAX_CONNECTIONS: int = 200
+    SITE_CHECK_SCAN_CONCURRENCY: int = 50
+    SITE_CHECK_MAX_BODY_BYTES: int = 512 * 1024  # stop reading a page after this many bytes
+    SITE_CHECK_HEAD_PROBES: bool = True  # HEAD instead of GET when only the status matters
+    SITE_CHECK_PER_HOST_CONCURRENCY: int = 4
+    SITE_CHECK_PER_HOST_RATE: float = 5.0  # requests per second per host, shared by all scans
+    SITE_CHECK_PER_HOST_BURST: int = 5
+    SITE_CHECK_MAX_RETRY_AFTER: float = 30.0  # longer Retry-After values are not waited for
+    SITE_CHECK_RATE_LIMIT_RETRIES: int = 1
+    SITE_CHECK_MIN_TIMEOUT: float = 2.0  # adaptive timeouts stay within [min, SITE_CHECK_TIMEOUT]
+    SITE_CHECK_TIMEOUT_PERCENTILE: float = 0.95
+    SITE_CHECK_TIMEOUT_MARGIN: float = 1.0
+    SITE_CHECK_LATENCY_WINDOW: int = 50
+    SITE_BREAKER_FAILURES: int = 5  # consecutive failures before a site is skipped
+    SITE_BREAKER_COOLDOWN: float = 120.0
+    STREAM_HEARTBEAT_SECONDS: float = 15.0
+    SCAN_DEADLINE_SECONDS: float = 300.0  # synchronous scans return partial results after this
+    QUICK_SCAN_DEADLINE_SECONDS: float = 5.0  # quick-scan SLA, partial results after this
+    QUICK_SCAN_SITE_TIMEOUT: float = 3.0
+    QUICK_SCAN_MAX_CONNECTIONS: int = 50
+    SCAN_CHECKPOINT_TTL_SECONDS: int = 60 * 60  # how long a partial scan can be resumed
+    DISCONNECT_POLL_SECONDS: float = 1.0  # how often synchronous scans check whether the client went away
+    SITE_CATALOG_CACHE_DIR: str = ""  # compiled catalog cache, must be private to the app user; defaults to a per-user dir in the system temp dir
+    
+    # DNS (MX lookups)
+    DNS_TIMEOUT: float = 3.0
+    DNS_CACHE_MAX_ENTRIES: int = 10000
+    DNS_MIN_TTL: int = 30  # record TTLs are clamped to [DNS_MIN_TTL, DNS_MAX_TTL]
+    DNS_MAX_TTL: int = 24 * 60 * 60
+    DNS_NEGATIVE_TTL: int = 5 * 60  # NXDOMAIN / no mail host
+    
+    # Domain intelligence (per-domain MX / disposable / free-provider facts)
+    DOMAIN_INTEL_TTL_SECONDS: int = 6 * 60 * 60  # older facts are served while being refreshed in the background
+    DOMAIN_INTEL_CACHE_SIZE: int = 20000
+    DOMAIN_INTEL_PRELOAD: int = 2000  # most looked-up domains loaded into memory at startup
+
+    # Extra domain lists (one domain per line), matched together with the bundled ones
+    DISPOSABLE_DOMAINS_FILE: str = ""
+    FREE_PROVIDERS_FILE: str = ""
+    DOMAIN_LIST_RELOAD_SECONDS: float = 60.0  # how often the files are checked for changes
+
+    # Bulk email triage (format / disposable / free / MX, no social scan)
+    BULK_EMAIL_MAX_ROWS: int = 100000
+    BULK_EMAIL_CONCURRENCY: int = 32  # domains resolved at once
+    BULK_EMAIL_ROWS_PER_TOKEN: int = 1000  # a batch costs ceil(rows / this) tokens
+
+    # Bulk phone parsing (offline phonenumbers metadata, no messaging checks)
+    BULK_PHONE_MAX_ROWS: int = 100000
+    BULK_PHONE_WORKERS: int = 0  # parser processes, 0 = one per CPU
+    BULK_PHONE_CHUNK_SIZE: int = 500  # numbers handed to a process at a time
+    BULK_PHONE_ROWS_PER_TOKEN: int = 1000
+
+    # Phone metadata (country / carrier / timezone / line type) memoized per number prefix
+    PHONE_METADATA_CACHE_SIZE: int = 50000
+    PHONE_WARMUP: bool = True  # preload phonenumbers data at startup (and in bulk parser processes)
+    PHONE_WARMUP_REGIONS: List[str] = ["ID"]  # _parse_phone assumes +62 for numbers without a country code
+    
+    # Background scan jobs
+    SCAN_JOB_WORKERS: int = 4  # concurrent jobs per API process
+    SCAN_JOB_POLL_SECONDS: float = 2.0  # how often idle workers look for jobs submitted elsewhere
+    SCAN_JOB_STALE_SECONDS: float = 300.0  # a running job without heartbeat for this long is requeued
+    SCAN_JOB_MAX_ATTEMPTS: int = 3
+    
+    # Scan result cache
+    SCAN_CACHE_TTL_SECONDS: int = 15 * 60
+    SCAN_CACHE_MAX_ENTRIES: int = 1024
+    SCAN_CACHE_MAX_MISSES: int = 10  # timed-out / failed checks a scan may have and still be cached
+    SCAN_CACHE_GAPPED_TTL_SECONDS: int = 2 * 60  # TTL of scans with skipped, timed-out or failed sites
+    SCAN_CACHE_SQLITE_PATH: str = ""  # shared on-disk tier for all workers, disabled when empty
+    
+    # Blackbird CLI result retention
+    BLACKBIRD_SCRATCH_DIR: str = ""  # defaults to backend/blackbird/runs
+    BLACKBIRD_RESULTS_MAX_AGE_SECONDS: int = 60 * 60
+    BLACKBIRD_RESULTS_MAX_BYTES: int = 200 * 1024 * 1024
+    BLACKBIRD_SWEEP_INTERVAL_SECONDS: int = 10 * 60
+    BLACKBIRD_KEEP_RUN_DIRS: bool = False
+    
     # Payment
     MAYAR_API_KEY: str = os.getenv("MAYAR_API_KEY", "")
     MAYAR_API_URL: str = "https://api.mayar.id/hl/v1"
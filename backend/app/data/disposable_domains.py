@@ -479,10 +479,12 @@ FREE_EMAIL_PROVIDERS = {
 
 
 def is_disposable(domain: str) -> bool:
-    """Check if email domain is a known disposable email provider."""
-    return domain.lower() in DISPOSABLE_DOMAINS
+    """Check if email domain (or a parent domain) is a known disposable email provider."""
+    from ..services.domain_index import get_domain_index
+    return get_domain_index().is_disposable(domain)
 
 
 def is_free_provider(domain: str) -> bool:
-    """Check if email domain is a known free email provider."""
-    return domain.lower() in FREE_EMAIL_PROVIDERS
+    """Check if email domain (or a parent domain) is a known free email provider."""
+    from ..services.domain_index import get_domain_index
+    return get_domain_index().is_free_provider(domain)
@@ -2,3 +2,6 @@ from .base import Base
 from .user import User
 from .osint import OsintLog
 from .transaction import Transaction
+from .scan_job import ScanJob
+from .domain_intel import DomainIntel
+from .scan_checkpoint import ScanCheckpoint
@@ -0,0 +1,18 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class DomainIntel(Base):
+    __tablename__ = "domain_intel"
+
+    domain = Column(String(255), primary_key=True, index=True)
+    mx_hosts = Column(Text, nullable=True) # JSON list, by preference
+    accepts_mail = Column(Boolean, default=False)
+    implicit_mx = Column(Boolean, default=False) # no MX, mail goes to the A/AAAA host
+    null_mx = Column(Boolean, default=False)
+    disposable = Column(Boolean, default=False)
+    free_provider = Column(Boolean, default=False)
+    catch_all = Column(Boolean, nullable=True) # unknown until a probe reports it
+    lookups = Column(Integer, default=0) # scans that asked for this domain, used to pick domains to preload
+    checked_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
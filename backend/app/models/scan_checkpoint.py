@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ScanCheckpoint(Base):
+    __tablename__ = "scan_checkpoints"
+
+    id = Column(String(32), primary_key=True, index=True) # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    data = Column(Text, nullable=False) # JSON string: scan options and the partial response
+    expires_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
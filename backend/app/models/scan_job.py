@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+class ScanJob(Base):
+    __tablename__ = "scan_jobs"
+
+    id = Column(String(32), primary_key=True, index=True) # uuid4 hex
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    module = Column(String(50), nullable=False) # email, phone
+    query = Column(String(255), nullable=False)
+    params = Column(Text, nullable=True) # JSON string of scan options
+    status = Column(String(20), default="queued", index=True) # queued, running, succeeded, failed
+    attempts = Column(Integer, default=0)
+    tokens = Column(Integer, default=0) # reserved from the balance at submit, refunded if the job fails
+    partial = Column(Text, nullable=True) # JSON string of results so far
+    result = Column(Text, nullable=True) # JSON string of the final response data
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True) # refreshed while a worker holds the job
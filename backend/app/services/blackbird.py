@@ -1,18 +1,23 @@
 """
-Blackbird Service - CLI-based Implementation
-Runs the Blackbird CLI tool via subprocess for reliable OSINT lookups.
+Blackbird Service
+Runs Blackbird OSINT lookups either in-process through the site check engine
+(default) or through the Blackbird CLI tool via subprocess.
 """
 
 import subprocess
+import signal
 import json
 import os
 import asyncio
-import glob
 import sys
+import time
 import logging
-from datetime import datetime
+import weakref
 from typing import List, Optional
 from dataclasses import dataclass
+from ..core.config import settings
+from .result_retention import ResultRetentionManager
+from .site_catalog import ScanScope
 
 @dataclass
 class BlackbirdResult:
@@ -25,7 +30,9 @@ class BlackbirdResult:
 
 
 class BlackbirdService:
-    """Service for running Blackbird OSINT via CLI."""
+    """Service for running Blackbird OSINT lookups."""
+    
+    CLI_TIMEOUT = 300  # seconds a CLI run may take before it is killed
     
     def __init__(self):
         # Path to the Blackbird CLI (backend/blackbird/)
@@ -33,90 +40,169 @@ class BlackbirdService:
         self.blackbird_dir = os.path.join(backend_dir, "blackbird")
         self.blackbird_script = os.path.join(self.blackbird_dir, "blackbird.py")
         self.results_dir = os.path.join(self.blackbird_dir, "results")
+        self.use_cli = settings.BLACKBIRD_ENGINE == "cli"
+        # Slack on top of the CLI timeout for claiming and parsing its output
+        self.retention = ResultRetentionManager(self.results_dir, run_timeout=self.CLI_TIMEOUT + 60)
+        # Blackbird names its output after the value, so runs for one value are serialized
+        self._value_locks = weakref.WeakValueDictionary()
         
-        logging.info(f"[BlackbirdService] Initialized with script at: {self.blackbird_script}")
-        
-        # Verify Blackbird exists
-        if not os.path.exists(self.blackbird_script):
-            raise FileNotFoundError(f"Blackbird not found at {self.blackbird_script}")
+        if self.use_cli:
+            logging.info(f"[BlackbirdService] Initialized with script at: {self.blackbird_script}")
+            
+            # Verify Blackbird exists
+            if not os.path.exists(self.blackbird_script):
+                raise FileNotFoundError(f"Blackbird not found at {self.blackbird_script}")
+        else:
+            logging.info("[BlackbirdService] Initialized with in-process site check engine")
     
-    async def check_email(self, email: str, deep_scan: bool = False) -> List[BlackbirdResult]:
-        """Check email using Blackbird CLI."""
+    def _engine(self, quick: bool = False):
+        """Shared in-process engine (imported lazily, it depends on BlackbirdResult)."""
+        from .site_engine import get_site_check_engine, get_quick_site_check_engine
+        return get_quick_site_check_engine() if quick else get_site_check_engine()
+    
+    async def check_email(self, email: str, deep_scan: bool = False, scope: Optional[ScanScope] = None) -> List[BlackbirdResult]:
+        """Check email against the email-specific sites (quick scans use the quick-scan pool)."""
         logging.info(f"[BlackbirdService] check_email called with: {email}")
-        return await self._run_blackbird("-e", email)
+        if not self.use_cli:
+            return await self._engine(quick=not deep_scan).check_email(email, scope)
+        return self._filter(await self._run_blackbird("-e", email), scope)
     
-    async def check_username(self, username: str) -> List[BlackbirdResult]:
-        """Check username using Blackbird CLI."""
-        return await self._run_blackbird("-u", username)
+    async def check_username(self, username: str, scope: Optional[ScanScope] = None) -> List[BlackbirdResult]:
+        """Check username against the WhatsMyName sites."""
+        if not self.use_cli:
+            return await self._engine().check_username(username, scope)
+        return self._filter(await self._run_blackbird("-u", username), scope)
 
     async def check_phone(self, phone: str) -> List[BlackbirdResult]:
         """
-        Check phone number using Blackbird CLI.
+        Check phone number against the phone sites.
         Note: Blackbird CLI uses '--phone' or '-p' for phone lookup if supported.
         Assuming '-p' is the flag based on standard CLI conventions for this tool.
         """
+        if not self.use_cli:
+            return await self._engine().check_phone(phone)
         return await self._run_blackbird("-p", phone)
     
+    def _filter(self, results: List[BlackbirdResult], scope: Optional[ScanScope]) -> List[BlackbirdResult]:
+        """
+        The CLI cannot be scoped before it runs, so drop out-of-scope hits afterwards.
+        """
+        if scope is None or scope.is_full:
+            return results
+        return [r for r in results if scope.allows(r.platform, r.category)]
+    
     async def _run_blackbird(self, flag: str, value: str) -> List[BlackbirdResult]:
-        """Run Blackbird CLI using async subprocess."""
-        results = []
+        """Run Blackbird CLI in its own scratch directory."""
+        lock = self._value_locks.get(value)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._value_locks[value] = lock
         
+        run_dir = self.retention.new_run_dir(value)
+        try:
+            async with lock:
+                started_at = time.time()
+                stdout_str = await self._exec_cli(flag, value)
+                json_files = self.retention.claim_results(value, started_at, run_dir)
+            return self._parse_results(json_files, stdout_str)
+        finally:
+            self.retention.release(run_dir)
+    
+    @staticmethod
+    def _kill_process_tree(process: subprocess.Popen):
+        """Kill the CLI and anything it spawned (it runs in its own process group)."""
+        if process.poll() is not None:
+            return
+        try:
+            if sys.platform == "win32":
+                subprocess.run(
+                    ["taskkill", "/F", "/T", "/PID", str(process.pid)],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+                )
+            else:
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, OSError) as e:
+            logging.warning(f"[BlackbirdService] Could not kill CLI process {process.pid}: {e}")
+    
+    async def _exec_cli(self, flag: str, value: str) -> str:
+        """
+        Run Blackbird CLI as a subprocess, waiting on it in a worker thread, and return its stdout.
+        If the calling task is cancelled (e.g. the client disconnected) the process tree is killed.
+        """
         logging.info(f"[BlackbirdService] Starting CLI execution for {flag} {value}")
         
+        # Prepare environment with enforced UTF-8 encoding
+        env = os.environ.copy()
+        env["PYTHONIOENCODING"] = "utf-8"
+        env["PYTHONUTF8"] = "1"
+        
+        # Own process group, so a kill reaches the CLI's children too
+        if sys.platform == "win32":
+            group = {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP}
+        else:
+            group = {"start_new_session": True}
+        
+        process = None
         try:
-            # Define sync function to run in thread
-            def run_cli():
-                # Prepare environment with enforced UTF-8 encoding
-                env = os.environ.copy()
-                env["PYTHONIOENCODING"] = "utf-8"
-                env["PYTHONUTF8"] = "1"
-                
-                return subprocess.run(
-                    [sys.executable, self.blackbird_script, flag, value, "--json", "--no-update"],
-                    cwd=self.blackbird_dir,
-                    capture_output=True,
-                    env=env,
-                    stdin=subprocess.DEVNULL,
-                    timeout=300
-                )
-
-            # Run blocking subprocess in a separate thread to avoid EventLoop issues on Windows
-            logging.info(f"[BlackbirdService] Spawning thread for subprocess...")
+            process = subprocess.Popen(
+                [sys.executable, self.blackbird_script, flag, value, "--json", "--no-update"],
+                cwd=self.blackbird_dir,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                stdin=subprocess.DEVNULL,
+                env=env,
+                **group
+            )
             
-            # Use asyncio.to_thread (Python 3.9+)
-            process = await asyncio.to_thread(run_cli)
+            # Wait in a separate thread to avoid EventLoop subprocess issues on Windows
+            stdout, stderr = await asyncio.to_thread(process.communicate, timeout=self.CLI_TIMEOUT)
             
             logging.info(f"[BlackbirdService] Subprocess completed with code: {process.returncode}")
             
             if process.returncode != 0:
-                logging.error(f"[BlackbirdService] Stderr: {process.stderr.decode('utf-8', errors='ignore')}")
+                logging.error(f"[BlackbirdService] Stderr: {stderr.decode('utf-8', errors='ignore')}")
                 # Don't return empty yet, sometimes it writes to stderr but still works
-             
-             # stdout/stderr are bytes because we used capture_output=True (implies binary mode without text=True)
-             # Decode for logging if needed, checking partial output
-            stdout_str = process.stdout.decode('utf-8', errors='ignore')
-            stderr_str = process.stderr.decode('utf-8', errors='ignore')
+            
+            return stdout.decode('utf-8', errors='ignore')
 
+        except asyncio.CancelledError:
+            if process is not None:
+                logging.info(f"[BlackbirdService] Scan cancelled, killing CLI process")
+                self._kill_process_tree(process)
+            raise
         except subprocess.TimeoutExpired:
-             logging.warning("[BlackbirdService] Subprocess timed out! Proceeding to check for partial results...")
-             stdout_str = "" # Unknown
+            logging.warning("[BlackbirdService] Subprocess timed out! Proceeding to check for partial results...")
+            self._kill_process_tree(process)
+            await asyncio.to_thread(process.communicate)
         except Exception as e:
-             logging.error(f"[BlackbirdService] Execution error: {e}")
-             # We might still want to check for files if it was just a subprocess error
-             stdout_str = ""
+            logging.error(f"[BlackbirdService] Execution error: {e}")
+            # We might still want to check for files if it was just a subprocess error
+        return ""
+    
+    @staticmethod
+    def _parse_metadata(entries) -> Optional[dict]:
+        """Blackbird's [{"type", "key"/"name", "value"}, ...] as name -> value."""
+        if not isinstance(entries, list):
+            return None
+        metadata = {
+            entry.get("key") or entry.get("name"): entry.get("value")
+            for entry in entries
+            if isinstance(entry, dict) and entry.get("value") is not None
+        }
+        metadata.pop(None, None)
+        return metadata or None
+    
+    def _parse_results(self, json_files: List[str], stdout_str: str) -> List[BlackbirdResult]:
+        """Parse the FOUND entries out of the JSON files claimed for this run."""
+        results = []
         
-        try:
-            # Find the result JSON file - look for folder starting with value followed by underscore (date)
-            # Format: {value}_{date}_blackbird/{value}_{date}_blackbird.json
-            # STRICTER PATTERN: Remove leading * and add _ to prevent 'user' matching 'user@email.com'
-            pattern = os.path.join(self.results_dir, f"{value}_*_blackbird", "*.json")
-            
-            logging.info(f"[BlackbirdService] Looking for results with pattern: {pattern}")
-            
-            json_files = glob.glob(pattern)
-            
-            if json_files:
-                json_file = json_files[0]
+        if not json_files:
+            logging.warning(f"[BlackbirdService] No result files found")
+            logging.warning(f"[BlackbirdService] Stdout: {stdout_str[-500:]}")
+            return results
+        
+        for json_file in json_files:
+            try:
                 logging.info(f"[BlackbirdService] Found: {json_file}")
                 
                 with open(json_file, 'r', encoding='utf-8') as f:
@@ -130,26 +216,13 @@ class BlackbirdService:
                             platform=site.get("name", "Unknown"),
                             url=site.get("url", ""),
                             exists=True,
-                            category=site.get("category", "unknown")
+                            category=site.get("category", "unknown"),
+                            metadata=self._parse_metadata(site.get("metadata"))
                         ))
-                
-                logging.info(f"[BlackbirdService] Parsed {len(results)} found accounts")
-                
-                # Cleanup
-                # try:
-                #     import shutil
-                #     shutil.rmtree(os.path.dirname(json_file))
-                # except Exception as e:
-                #     logging.warning(f"[BlackbirdService] Cleanup warning: {e}")
-            else:
-                logging.warning(f"[BlackbirdService] No result files found")
-                logging.warning(f"[BlackbirdService] Stdout: {stdout_str[-500:]}")
-                
-        except Exception as e:
-            logging.error(f"[BlackbirdService] Error: {e}")
-            import traceback
-            traceback.print_exc()
+            except Exception as e:
+                logging.error(f"[BlackbirdService] Error reading {json_file}: {e}")
         
+        logging.info(f"[BlackbirdService] Parsed {len(results)} found accounts")
         return results
 
 
@@ -0,0 +1,53 @@
+"""
+Bulk Upload
+Reads the uploaded lists of the bulk endpoints: CSV with an optional header
+row, or NDJSON with one object (or plain string) per line.
+"""
+
+import csv
+import json
+from typing import Iterable, Iterator, Optional
+
+
+CSV = "csv"
+NDJSON = "ndjson"
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> str:
+    """NDJSON for .ndjson/.jsonl uploads or JSON content types, CSV otherwise."""
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "json" in (content_type or ""):
+        return NDJSON
+    return CSV
+
+
+def parse_column(lines: Iterable[str], fmt: str, name: str) -> Iterator[str]:
+    """
+    Values from CSV (the `name` column when there is such a header, else the
+    first column) or NDJSON (objects with a `name` key, or plain strings).
+    """
+    if fmt == NDJSON:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError:
+                yield line
+                continue
+            if isinstance(value, dict):
+                value = value.get(name) or ""
+            yield str(value).strip()
+        return
+
+    column = 0
+    for index, cells in enumerate(csv.reader(lines)):
+        if not cells:
+            continue
+        if index == 0:
+            header = [cell.strip().lower() for cell in cells]
+            if name in header:
+                column = header.index(name)
+                continue
+        yield cells[column].strip() if column < len(cells) else ""
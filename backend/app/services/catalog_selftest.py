@@ -0,0 +1,275 @@
+"""
+Catalog Self-Test
+Drives the site check engine over each catalog entry's `known` accounts (plus
+one account that should not exist) and reports per-site precision/recall and
+check cost as JSON.
+
+Two modes:
+    record  - hit the live sites once and store the full responses
+    replay  - serve the stored responses from a local HTTP server (no network),
+              suitable for CI
+
+Usage:
+    python -m app.services.catalog_selftest record --recordings catalog.jsonl
+    python -m app.services.catalog_selftest replay --recordings catalog.jsonl --report report.json
+"""
+
+import sys
+import json
+import time
+import base64
+import asyncio
+import hashlib
+import argparse
+import logging
+from typing import Dict, List, Optional, Set
+
+import httpx
+from aiohttp import web
+
+from .site_catalog import ScanScope, SiteRecord, get_site_catalog, USERNAME_CATALOG
+from .site_engine import SiteCheckEngine, FOUND, NOT_FOUND
+from .input_transforms import ScanTransforms
+
+
+# Account used as the negative control for every site
+MISSING_ACCOUNT = "blackeagle-selftest-7f3c9q-nouser"
+
+REPLAY_KEY_HEADER = "X-Replay-Key"
+
+# Response headers that no longer describe a body stored decoded
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+def request_key(method: str, url: str, body: Optional[bytes]) -> str:
+    """Stable key for one outgoing request."""
+    digest = hashlib.sha1()
+    digest.update(method.upper().encode())
+    digest.update(b" ")
+    digest.update(str(url).encode())
+    digest.update(b"\n")
+    digest.update(body or b"")
+    return digest.hexdigest()
+
+
+def load_recordings(path: str) -> Dict[str, dict]:
+    recordings = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                recordings[entry["key"]] = entry
+    return recordings
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Passes requests to the network and keeps a full copy of every response."""
+
+    def __init__(self, max_bytes: int):
+        self.inner = httpx.AsyncHTTPTransport()
+        self.max_bytes = max_bytes
+        self.recordings: List[dict] = []
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        response = await self.inner.handle_async_request(request)
+        content = b""
+        async for chunk in response.aiter_bytes():
+            content += chunk
+            if len(content) >= self.max_bytes:
+                break
+        await response.aclose()
+
+        headers = {k: v for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS}
+        self.recordings.append({
+            "key": request_key(request.method, request.url, body),
+            "method": request.method,
+            "url": str(request.url),
+            "status": response.status_code,
+            "headers": headers,
+            "content_b64": base64.b64encode(content).decode("ascii"),
+        })
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Sends every request to the local replay server, tagged with its key."""
+
+    def __init__(self, server_url: str):
+        self.inner = httpx.AsyncHTTPTransport()
+        self.server_url = httpx.URL(server_url)
+        self.missing: Set[str] = set()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body = await request.aread()
+        key = request_key(request.method, request.url, body)
+        local = httpx.Request(
+            request.method,
+            self.server_url.copy_with(path="/replay"),
+            headers={REPLAY_KEY_HEADER: key},
+            content=body,
+        )
+        response = await self.inner.handle_async_request(local)
+        if response.headers.get("X-Replay-Missing"):
+            self.missing.add(str(request.url))
+        return response
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+async def start_replay_server(recordings: Dict[str, dict]) -> web.AppRunner:
+    """Serve recorded responses on 127.0.0.1 (random port)."""
+
+    async def replay(request: web.Request) -> web.Response:
+        entry = recordings.get(request.headers.get(REPLAY_KEY_HEADER, ""))
+        if entry is None:
+            return web.Response(status=404, headers={"X-Replay-Missing": "1"})
+        return web.Response(
+            status=entry["status"],
+            headers=entry["headers"],
+            body=base64.b64decode(entry["content_b64"]),
+        )
+
+    app = web.Application()
+    app.router.add_route("*", "/replay", replay)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def _server_url(runner: web.AppRunner) -> str:
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+
+async def run_checks(engine: SiteCheckEngine, sites: List[SiteRecord]) -> Dict[str, List]:
+    """Check each site's known accounts and the negative control."""
+    checks = []
+    for site in sites:
+        checks.extend((site, account) for account in site.known)
+        checks.append((site, MISSING_ACCOUNT))
+
+    outcomes: Dict[str, List] = {site.key: [] for site in sites}
+    async for outcome in engine.iter_checks(checks):
+        outcomes[outcome.site.key].append(outcome)
+    return outcomes
+
+
+def build_report(catalog, sites: List[SiteRecord], outcomes: Dict[str, List], missing_urls: Set[str]) -> dict:
+    """Per-site precision/recall and cost, plus a catalog-wide summary."""
+    rows = []
+    transforms = ScanTransforms()
+    for site in sites:
+        site_outcomes = outcomes[site.key]
+        unrecorded = [
+            o for o in site_outcomes
+            if site.url(transforms.account(site, o.value)) in missing_urls
+        ]
+        scored = [o for o in site_outcomes if all(o is not u for u in unrecorded)]
+        known = [o for o in scored if o.value != MISSING_ACCOUNT]
+        negative = [o for o in scored if o.value == MISSING_ACCOUNT]
+
+        true_positives = sum(o.status == FOUND for o in known)
+        false_positives = sum(o.status == FOUND for o in negative)
+        flagged = true_positives + false_positives
+
+        rows.append({
+            "site": site.name,
+            "category": site.category,
+            "known_checked": len(known),
+            "known_found": true_positives,
+            "negative_checked": len(negative),
+            "false_positives": false_positives,
+            "recall": round(true_positives / len(known), 3) if known else None,
+            "precision": round(true_positives / flagged, 3) if flagged else None,
+            "unrecorded": len(unrecorded),
+            "errors": [o.status for o in scored if o.status not in (FOUND, NOT_FOUND)],
+            "mean_ms": round(1000 * sum(o.elapsed for o in scored) / len(scored), 2) if scored else None,
+            "bytes_read": sum(o.bytes_read for o in scored),
+        })
+
+    scored_rows = [r for r in rows if r["recall"] is not None]
+    return {
+        "catalog": catalog.name,
+        "catalog_version": catalog.version,
+        "generated_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "summary": {
+            "sites": len(rows),
+            "sites_scored": len(scored_rows),
+            "sites_failing": sum(1 for r in scored_rows if r["recall"] < 1.0 or r["false_positives"]),
+            "mean_recall": round(sum(r["recall"] for r in scored_rows) / len(scored_rows), 3) if scored_rows else None,
+            "total_bytes_read": sum(r["bytes_read"] for r in rows),
+        },
+        "sites": rows,
+    }
+
+
+async def record(args) -> int:
+    catalog = get_site_catalog(args.catalog)
+    sites = [s for s in catalog.select(ScanScope.build(sites=args.sites)) if s.known]
+    transport = RecordingTransport(args.max_bytes)
+    engine = SiteCheckEngine(transport=transport)
+    try:
+        await run_checks(engine, sites)
+    finally:
+        await engine.aclose()
+
+    with open(args.recordings, "w", encoding="utf-8") as f:
+        for entry in transport.recordings:
+            f.write(json.dumps(entry) + "\n")
+    logging.info(f"[CatalogSelfTest] Recorded {len(transport.recordings)} responses for {len(sites)} sites")
+    return 0
+
+
+async def replay(args) -> int:
+    catalog = get_site_catalog(args.catalog)
+    sites = [s for s in catalog.select(ScanScope.build(sites=args.sites)) if s.known]
+    runner = await start_replay_server(load_recordings(args.recordings))
+    transport = ReplayTransport(_server_url(runner))
+    engine = SiteCheckEngine(transport=transport)
+    try:
+        started = time.monotonic()
+        outcomes = await run_checks(engine, sites)
+        elapsed = time.monotonic() - started
+    finally:
+        await engine.aclose()
+        await runner.cleanup()
+
+    report = build_report(catalog, sites, outcomes, transport.missing)
+    report["summary"]["elapsed_seconds"] = round(elapsed, 3)
+    output = json.dumps(report, indent=2)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(output)
+    else:
+        print(output)
+
+    summary = report["summary"]
+    logging.info(f"[CatalogSelfTest] {summary['sites_failing']}/{summary['sites_scored']} scored sites failing")
+    if args.min_recall is not None and (summary["mean_recall"] or 0) < args.min_recall:
+        return 1
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Offline self-test and benchmark for the site catalogs")
+    parser.add_argument("mode", choices=["record", "replay"])
+    parser.add_argument("--recordings", required=True, help="JSONL file of recorded responses")
+    parser.add_argument("--report", help="Write the JSON report here instead of stdout (replay)")
+    parser.add_argument("--catalog", default=USERNAME_CATALOG)
+    parser.add_argument("--sites", nargs="*", help="Limit to these site names")
+    parser.add_argument("--max-bytes", type=int, default=1024 * 1024, help="Body bytes kept per recording")
+    parser.add_argument("--min-recall", type=float, help="Exit non-zero when mean recall is below this")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    return asyncio.run(record(args) if args.mode == "record" else replay(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,228 @@
+"""
+Domain Index
+Disposable / free-provider classification that scales to large blocklists.
+Lists are kept as sorted, newline-separated keys of reversed labels
+("com.mailinator") so a domain and all of its parent domains are each one
+binary search away, and subdomains such as x.mailinator.com match their
+listed parent. External lists are compiled once into a sorted .idx file and
+memory-mapped, so every worker process shares the same pages. An .idx starts
+with a header line recording the source's mtime and size and is recompiled
+whenever they differ, so sources copied with cp -p / rsync -t (which keep an
+older mtime) are picked up too. A background task recompiles a list off the
+event loop when its source file changes and swaps in the new mapping; lookups
+only ever read the current one.
+"""
+
+import os
+import mmap
+import asyncio
+import hashlib
+import logging
+import tempfile
+from typing import Iterable, Optional, Tuple, Union
+
+from ..core.config import settings
+from ..data.disposable_domains import DISPOSABLE_DOMAINS, FREE_EMAIL_PROVIDERS
+
+
+def normalize_domain(domain: str) -> str:
+    return domain.strip().lower().strip(".")
+
+
+def reverse_labels(domain: str) -> str:
+    """mail.example.com -> com.example.mail"""
+    return ".".join(reversed(domain.split(".")))
+
+
+def _parse_line(line: str) -> Optional[str]:
+    """A domain from one list line; comments, blanks and "*." wildcards handled."""
+    line = line.split("#", 1)[0].strip()
+    if line.startswith("*."):
+        line = line[2:]
+    domain = normalize_domain(line)
+    return domain or None
+
+
+def pack_domains(domains: Iterable[str]) -> bytes:
+    """Sorted, de-duplicated reversed keys, one per line."""
+    keys = sorted({reverse_labels(d).encode() for d in domains if d})
+    return b"".join(key + b"\n" for key in keys)
+
+
+def source_header(st: os.stat_result) -> bytes:
+    """The .idx header line identifying the source file version it was compiled from."""
+    return f"# source mtime_ns={st.st_mtime_ns} size={st.st_size}\n".encode()
+
+
+def compile_domain_list(source: str, target: str, header: bytes = b"") -> int:
+    """Compile a one-domain-per-line list into a sorted index file; returns the entry count."""
+    with open(source, encoding="utf-8", errors="ignore") as f:
+        packed = pack_domains(_parse_line(line) for line in f)
+    # Several workers may compile at once; each writes its own file and the last rename wins
+    scratch = f"{target}.{os.getpid()}.tmp"
+    with open(scratch, "wb") as f:
+        f.write(header)
+        f.write(packed)
+    os.replace(scratch, target)
+    return packed.count(b"\n")
+
+
+class SortedDomains:
+    """Binary search over sorted newline-terminated keys (bytes or mmap) after a header of start bytes."""
+
+    __slots__ = ("buffer", "start", "size")
+
+    def __init__(self, buffer: Union[bytes, mmap.mmap], start: int = 0):
+        self.buffer = buffer
+        self.start = start
+        self.size = len(buffer)
+
+    def __contains__(self, key: bytes) -> bool:
+        buffer = self.buffer
+        lo, hi = self.start, self.size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = buffer.rfind(b"\n", 0, mid) + 1
+            end = buffer.find(b"\n", start)
+            if end < 0:
+                end = self.size
+            line = buffer[start:end]
+            if line == key:
+                return True
+            if line < key:
+                lo = end + 1
+            else:
+                hi = start
+        return False
+
+
+def _open_mapped(path: str) -> Tuple[bytes, SortedDomains]:
+    """The header line of an index file and its keys."""
+    with open(path, "rb") as f:
+        header = f.readline()
+        if os.fstat(f.fileno()).st_size == len(header):
+            return header, SortedDomains(b"")
+        # The mapping stays valid after the file is closed
+        return header, SortedDomains(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ), len(header))
+
+
+class DomainList:
+    """The bundled domains of one kind plus an optional external list file."""
+
+    def __init__(self, name: str, bundled: Iterable[str], path: str = ""):
+        self.name = name
+        self.path = path
+        self._bundled = SortedDomains(pack_domains(normalize_domain(d) for d in bundled))
+        self._external: Optional[SortedDomains] = None
+        self._source_header = b""
+        if path:
+            self.reload()
+
+    def _index_path(self) -> str:
+        target = f"{self.path}.idx"
+        if os.access(os.path.dirname(os.path.abspath(target)), os.W_OK):
+            return target
+        digest = hashlib.sha1(os.path.abspath(self.path).encode()).hexdigest()[:16]
+        return os.path.join(tempfile.gettempdir(), f"domain-index-{digest}.idx")
+
+    def reload(self):
+        """
+        (Re)load the external list, compiling it first when the .idx was built
+        from another version of the source. Blocking: run it off the event loop.
+        """
+        try:
+            header = source_header(os.stat(self.path))
+            target = self._index_path()
+            compiled = _open_mapped(target) if os.path.exists(target) else None
+            if compiled is None or compiled[0] != header:
+                count = compile_domain_list(self.path, target, header)
+                logging.info(f"[DomainIndex] Compiled {count} {self.name} domains into {target}")
+                compiled = _open_mapped(target)
+            # The previous mapping is released once no lookup references it
+            self._external = compiled[1]
+            self._source_header = header
+        except OSError as e:
+            logging.error(f"[DomainIndex] Could not load {self.name} list {self.path}: {e}")
+
+    def refresh(self):
+        """Reload the external list if its source file changed (blocking)."""
+        if not self.path:
+            return
+        try:
+            changed = source_header(os.stat(self.path)) != self._source_header
+        except OSError:
+            return
+        if changed:
+            self.reload()
+
+    def matches(self, domain: str) -> bool:
+        """Whether the domain or any of its parent domains is listed."""
+        labels = normalize_domain(domain).split(".")
+        external = self._external
+        key = b""
+        for label in reversed(labels):
+            key = key + b"." + label.encode() if key else label.encode()
+            if key in self._bundled or (external is not None and key in external):
+                return True
+        return False
+
+
+class DomainIndex:
+    """Disposable and free-provider lists."""
+
+    def __init__(self):
+        self.reload_interval = settings.DOMAIN_LIST_RELOAD_SECONDS
+        self.disposable = DomainList("disposable", DISPOSABLE_DOMAINS, settings.DISPOSABLE_DOMAINS_FILE)
+        self.free = DomainList("free-provider", FREE_EMAIL_PROVIDERS, settings.FREE_PROVIDERS_FILE)
+        self._task: Optional[asyncio.Task] = None
+
+    def is_disposable(self, domain: str) -> bool:
+        return self.disposable.matches(domain)
+
+    def is_free_provider(self, domain: str) -> bool:
+        return self.free.matches(domain)
+
+    def reload(self):
+        for domain_list in (self.disposable, self.free):
+            if domain_list.path:
+                domain_list.reload()
+
+    def refresh(self):
+        for domain_list in (self.disposable, self.free):
+            domain_list.refresh()
+
+    async def _reload_loop(self):
+        while True:
+            await asyncio.sleep(self.reload_interval)
+            try:
+                await asyncio.to_thread(self.refresh)
+            except Exception as e:
+                logging.error(f"[DomainIndex] Reload failed: {e}")
+
+    def start(self):
+        """Watch the external lists for changes on the running event loop."""
+        if not (self.disposable.path or self.free.path):
+            return
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._reload_loop())
+
+    async def stop(self):
+        """Stop watching the external lists."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+_domain_index = None
+
+def get_domain_index() -> DomainIndex:
+    """Get or create singleton DomainIndex instance."""
+    global _domain_index
+    if _domain_index is None:
+        _domain_index = DomainIndex()
+    return _domain_index
@@ -0,0 +1,223 @@
+"""
+Domain Intelligence
+Per-domain facts (MX hosts, disposable / free-provider flags, catch-all hint)
+shared by every scan: an in-process LRU in front of the domain_intel table,
+with DNS only consulted for domains seen for the first time. Known domains
+past their TTL are served from the store and refreshed in the background.
+"""
+
+import json
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import List, Optional, Set, Tuple
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.domain_intel import DomainIntel
+from .domain_index import get_domain_index
+from .mx_resolver import get_mx_resolver
+from .single_flight import SingleFlight
+
+
+@dataclass
+class DomainFacts:
+    """What we know about one email domain."""
+    domain: str
+    disposable: bool = False
+    free_provider: bool = False
+    mx_hosts: List[str] = field(default_factory=list)
+    accepts_mail: bool = False
+    implicit_mx: bool = False
+    null_mx: bool = False
+    catch_all: Optional[bool] = None
+    checked_at: float = 0.0  # epoch seconds of the last DNS check, 0 if DNS was unreachable
+
+
+def _epoch(value: datetime) -> float:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class DomainIntelService:
+    """LRU + database store of DomainFacts."""
+
+    def __init__(self):
+        self.ttl = settings.DOMAIN_INTEL_TTL_SECONDS
+        self.max_entries = settings.DOMAIN_INTEL_CACHE_SIZE
+        self.preload_count = settings.DOMAIN_INTEL_PRELOAD
+        self._cache: "OrderedDict[str, DomainFacts]" = OrderedDict()
+        self._flights = SingleFlight("domain")
+        self._refreshing: Set[str] = set()
+        # Background refreshes, referenced until done so they aren't garbage collected
+        self._refresh_tasks: Set[asyncio.Task] = set()
+        # Lookups since the row was last written, flushed on the next write (LRU, max_entries)
+        self._lookups: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _remember(self, facts: DomainFacts):
+        self._cache[facts.domain] = facts
+        self._cache.move_to_end(facts.domain)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _count_lookup(self, domain: str):
+        self._lookups[domain] = self._lookups.get(domain, 0) + 1
+        self._lookups.move_to_end(domain)
+        while len(self._lookups) > self.max_entries:
+            self._lookups.popitem(last=False)
+
+    def classify(self, domain: str) -> Tuple[bool, bool]:
+        """(disposable, free_provider) without any I/O."""
+        index = get_domain_index()
+        return index.is_disposable(domain), index.is_free_provider(domain)
+
+    # Database access (run in a worker thread)
+
+    def _load(self, domain: str) -> Optional[DomainFacts]:
+        db = SessionLocal()
+        try:
+            row = db.query(DomainIntel).filter(DomainIntel.domain == domain).first()
+            return self._from_row(row) if row else None
+        finally:
+            db.close()
+
+    def _from_row(self, row: DomainIntel) -> DomainFacts:
+        return DomainFacts(
+            domain=row.domain,
+            mx_hosts=json.loads(row.mx_hosts or "[]"),
+            accepts_mail=row.accepts_mail,
+            implicit_mx=row.implicit_mx,
+            null_mx=row.null_mx,
+            catch_all=row.catch_all,
+            checked_at=_epoch(row.checked_at),
+        )
+
+    def _store(self, facts: DomainFacts, lookups: int):
+        db = SessionLocal()
+        try:
+            row = db.query(DomainIntel).filter(DomainIntel.domain == facts.domain).first()
+            if row is None:
+                row = DomainIntel(domain=facts.domain, lookups=0)
+                db.add(row)
+            row.mx_hosts = json.dumps(facts.mx_hosts)
+            row.accepts_mail = facts.accepts_mail
+            row.implicit_mx = facts.implicit_mx
+            row.null_mx = facts.null_mx
+            row.disposable = facts.disposable
+            row.free_provider = facts.free_provider
+            row.lookups = (row.lookups or 0) + lookups
+            row.checked_at = datetime.fromtimestamp(facts.checked_at, timezone.utc)
+            db.commit()
+        finally:
+            db.close()
+
+    def _top_domains(self, limit: int) -> List[DomainFacts]:
+        db = SessionLocal()
+        try:
+            rows = db.query(DomainIntel).order_by(DomainIntel.lookups.desc()).limit(limit).all()
+            return [self._from_row(row) for row in rows]
+        finally:
+            db.close()
+
+    # Lookups
+
+    async def _check(self, domain: str, previous: Optional[DomainFacts]) -> DomainFacts:
+        """Resolve the domain and persist the result (keeps previous facts if DNS is unreachable)."""
+        answer = await get_mx_resolver().resolve(domain)
+        if answer is None:
+            if previous is not None:
+                return previous
+            return self._classified(DomainFacts(domain=domain))
+
+        facts = self._classified(DomainFacts(
+            domain=domain,
+            mx_hosts=answer.hosts,
+            accepts_mail=answer.accepts_mail,
+            implicit_mx=answer.implicit,
+            null_mx=answer.null_mx,
+            catch_all=previous.catch_all if previous else None,
+            checked_at=time.time(),
+        ))
+        self._remember(facts)
+        try:
+            await asyncio.to_thread(self._store, facts, self._lookups.pop(domain, 0))
+        except Exception as e:
+            logging.warning(f"[DomainIntel] Could not store {domain}: {e}")
+        return facts
+
+    async def _refresh(self, facts: DomainFacts):
+        try:
+            await self._flights.do(facts.domain, lambda: self._check(facts.domain, facts))
+        except Exception as e:
+            logging.warning(f"[DomainIntel] Refresh of {facts.domain} failed: {e}")
+        finally:
+            self._refreshing.discard(facts.domain)
+
+    def _classified(self, facts: DomainFacts) -> DomainFacts:
+        # Always from the domain lists, which may have been reloaded since the facts were stored
+        facts.disposable, facts.free_provider = self.classify(facts.domain)
+        return facts
+
+    def _serve(self, facts: DomainFacts) -> DomainFacts:
+        """Return stored facts, refreshing them in the background once past the TTL."""
+        self._classified(facts)
+        if time.time() - facts.checked_at > self.ttl and facts.domain not in self._refreshing:
+            self._refreshing.add(facts.domain)
+            task = asyncio.ensure_future(self._refresh(facts))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return facts
+
+    async def lookup(self, domain: str) -> DomainFacts:
+        """Facts for a domain. Only domains never seen before wait for DNS."""
+        domain = domain.strip().lower().rstrip(".")
+        self._count_lookup(domain)
+
+        facts = self._cache.get(domain)
+        if facts is not None and facts.checked_at:
+            self._cache.move_to_end(domain)
+            self.hits += 1
+            return self._serve(facts)
+
+        try:
+            stored = await asyncio.to_thread(self._load, domain)
+        except Exception as e:
+            logging.warning(f"[DomainIntel] Could not load {domain}: {e}")
+            stored = None
+        if stored is not None:
+            self._remember(stored)
+            self.hits += 1
+            return self._serve(stored)
+
+        self.misses += 1
+        return await self._flights.do(domain, lambda: self._check(domain, None))
+
+    async def preload(self):
+        """Load the most looked-up domains into memory (call from the app's startup hook)."""
+        if not self.preload_count:
+            return
+        try:
+            rows = await asyncio.to_thread(self._top_domains, self.preload_count)
+        except Exception as e:
+            logging.warning(f"[DomainIntel] Preload failed: {e}")
+            return
+        for facts in reversed(rows):
+            self._remember(facts)
+        logging.info(f"[DomainIntel] Preloaded {len(rows)} domains")
+
+
+# Singleton instance
+_domain_intel_service = None
+
+def get_domain_intel_service() -> DomainIntelService:
+    """Get or create singleton DomainIntelService instance."""
+    global _domain_intel_service
+    if _domain_intel_service is None:
+        _domain_intel_service = DomainIntelService()
+    return _domain_intel_service
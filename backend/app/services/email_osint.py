@@ -10,14 +10,17 @@ Comprehensive email intelligence gathering including:
 
 import re
 import sys
+import time
 import logging
-import hashlib
 import asyncio
-import dns.resolver
 import httpx
-from typing import Optional, List
+from typing import AsyncIterator, Optional, List
 from dataclasses import dataclass, field
-from ..data.disposable_domains import is_disposable, is_free_provider
+from ..core.config import settings
+from .site_catalog import ScanScope
+from .single_flight import SingleFlight
+from .input_transforms import QueryTransforms
+from .domain_intel import get_domain_intel_service
 
 
 @dataclass
@@ -48,18 +51,20 @@ class SocialProfile:
     exists: bool = False
     category: str = "unknown"
     icon: str = "globe"
+    sources: list = field(default_factory=list)  # scan inputs that produced the hit ("email", "username")
+    metadata: Optional[dict] = None  # fields extracted by the site's metadata rules (name, avatar, ...)
 
 
 @dataclass
 class EmailOsintResult:
     """Complete email OSINT result."""
     email: str
-    valid: bool = False
+    valid: Optional[bool] = False
     format_valid: bool = False
-    mx_valid: bool = False
+    mx_valid: Optional[bool] = False  # None when the MX lookup didn't finish (valid / deliverable follow)
     disposable: bool = False
     free_provider: bool = False
-    deliverable: bool = False
+    deliverable: Optional[bool] = False
     
     # Breach data
     breached: bool = False
@@ -73,6 +78,38 @@ class EmailOsintResult:
     # Social profiles
     social_profiles: list = field(default_factory=list)
     social_count: int = 0
+    
+    # Coverage (sites skipped by an open circuit breaker, not answered - rate limited or request error - or timed out)
+    sites_checked: int = 0
+    sites_skipped: list = field(default_factory=list)
+    sites_failed: list = field(default_factory=list)
+    sites_timed_out: list = field(default_factory=list)
+    
+    # Set when the scan deadline hit before every site check finished
+    partial: bool = False
+    sites_pending: list = field(default_factory=list)
+    sites_pending_keys: list = field(default_factory=list)  # "catalog:name", what a resume re-runs
+    
+    # "quick" (email sites + curated username sites) or "deep" (full catalogs)
+    scan_mode: str = "quick"
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class UsernameScanResult:
+    """Username-only social profile scan result."""
+    username: str
+    social_profiles: list = field(default_factory=list)
+    social_count: int = 0
+    
+    # Coverage
+    sites_checked: int = 0
+    sites_skipped: list = field(default_factory=list)
+    sites_failed: list = field(default_factory=list)
+    sites_timed_out: list = field(default_factory=list)
+    partial: bool = False
+    sites_pending: list = field(default_factory=list)
+    sites_pending_keys: list = field(default_factory=list)  # "catalog:name", what a resume re-runs
 
 
 class EmailOsintService:
@@ -83,22 +120,52 @@ class EmailOsintService:
         r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
     )
     
+    # Emit a progress event every N completed site checks when streaming
+    PROGRESS_EVERY = 25
+    
     def __init__(self):
         # Shorter timeouts for faster response
         self.timeout = httpx.Timeout(5.0, connect=3.0)
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        self._flights = SingleFlight("email")
     
-    async def investigate(self, email: str, deep_scan: bool = False) -> EmailOsintResult:
+    async def investigate(
+        self, email: str, deep_scan: bool = False, scope: Optional[ScanScope] = None,
+        extract_metadata: bool = True
+    ) -> EmailOsintResult:
         """
         Perform comprehensive email investigation using Blackbird.
-        deep_scan: If True, checks 700+ username sites. If False, only 16 email-specific sites.
+        deep_scan: If True, checks the full username catalog (700+ sites). If False, the email
+        sites plus a curated username subset, under the quick-scan deadline.
+        scope: Optional category/site restriction applied before any request is sent.
+        extract_metadata: Fill profile metadata (names, avatars) from the responses of hits.
+        Concurrent identical calls share one scan and the same (read-only) result;
+        the email is normalized first so every sharer gets the same input back.
         """
+        email = email.strip().lower()
+        key = (email, deep_scan, (scope or ScanScope()).cache_key(), extract_metadata)
+        return await self._flights.do(key, lambda: self._investigate(email, deep_scan, scope, extract_metadata))
+    
+    async def _investigate(
+        self, email: str, deep_scan: bool = False, scope: Optional[ScanScope] = None,
+        extract_metadata: bool = True
+    ) -> EmailOsintResult:
         print(f"[OSINT] investigate() called with email={email}, deep_scan={deep_scan}")
         sys.stdout.flush()
         
-        result = EmailOsintResult(email=email)
+        started = time.monotonic()
+        result = EmailOsintResult(email=email, scan_mode="deep" if deep_scan else "quick")
+        try:
+            return await self._investigate_into(result, email, deep_scan, scope, extract_metadata)
+        finally:
+            result.elapsed_seconds = round(time.monotonic() - started, 3)
+    
+    async def _investigate_into(
+        self, result: EmailOsintResult, email: str, deep_scan: bool, scope: Optional[ScanScope],
+        extract_metadata: bool
+    ) -> EmailOsintResult:
         
         # Step 1: Validate email format
         result.format_valid = self._validate_format(email)
@@ -110,29 +177,38 @@ class EmailOsintService:
         username = email.split("@")[0].lower()
         
         # Step 2: Check disposable and free provider (instant, no network)
-        result.disposable = is_disposable(domain)
-        result.free_provider = is_free_provider(domain)
+        result.disposable, result.free_provider = get_domain_intel_service().classify(domain)
         
         # Step 3: Run async checks (MX + Blackbird)
+        # MX is its own task so the scan deadline doesn't throw away its answer
+        mx_task = asyncio.ensure_future(self._check_mx_records(domain))
         try:
             # We only look for MX records and Social Profiles (Blackbird)
             # Gravatar and Breaches are removed as requested to rely ONLY on Blackbird
-            mx_valid, social_profiles = await asyncio.wait_for(
-                asyncio.gather(
-                    self._check_mx_records(domain),
-                    self._check_social_profiles(email, username, deep_scan),
-                    return_exceptions=True
-                ),
-                timeout=300.0  # Increased for Blackbird CLI which takes ~20-30 seconds (or more for username)
+            social_profiles = await asyncio.wait_for(
+                self._check_social_profiles(email, username, deep_scan, scope, result, extract_metadata),
+                timeout=settings.SCAN_DEADLINE_SECONDS if deep_scan else settings.QUICK_SCAN_DEADLINE_SECONDS
             )
         except asyncio.TimeoutError:
-            # If timeout, return what we have
-            mx_valid = False
-            social_profiles = []
+            # Keep every profile found before the deadline; the rest is listed in sites_pending
+            social_profiles = list(result.social_profiles)
+            result.partial = True
+        except asyncio.CancelledError:
+            mx_task.cancel()
+            raise
+        except Exception as e:
+            social_profiles = e
         
-        # Handle MX result
-        if isinstance(mx_valid, bool):
-            result.mx_valid = mx_valid
+        # Handle MX result: unknown (None) if the lookup is still running at the deadline or failed
+        if result.partial and not mx_task.done():
+            mx_task.cancel()
+            result.mx_valid = None
+        else:
+            try:
+                result.mx_valid = await mx_task
+            except Exception as e:
+                logging.warning(f"[OSINT] MX lookup for {domain} failed: {e}")
+                result.mx_valid = None
         
         # Overall validity
         result.valid = result.format_valid and result.mx_valid
@@ -151,60 +227,219 @@ class EmailOsintService:
             result.social_profiles = social_profiles
             result.social_count = len([p for p in social_profiles if p.exists])
             
-            # Use Blackbird's Gravatar result if present to populate gravatar field
-            # This keeps the frontend UI for Gravatar working if Blackbird finds it
-            for profile in result.social_profiles:
-                if profile.platform.lower() == "gravatar" and profile.exists:
-                    result.gravatar_url = profile.url
-                    # Construct a basic profile object so UI doesn't break
-                    result.gravatar = GravatarProfile(
-                        url=profile.url,
-                        hash=hashlib.md5(email.lower().encode()).hexdigest(),
-                        display_name=None, # Blackbird might not return this detail in simple check
-                        profile_url=profile.url
-                    )
+            self._apply_gravatar(result, email)
 
         return result
     
+    async def investigate_stream(
+        self, email: str, deep_scan: bool = False, scope: Optional[ScanScope] = None,
+        extract_metadata: bool = True
+    ) -> AsyncIterator[dict]:
+        """
+        Streaming variant of investigate().
+        Yields {"event": ..., "data": ...} dicts: "start" with the instant checks,
+        one "profile" per hit as soon as its site check resolves, "progress"
+        counters, and a final "summary" carrying the complete EmailOsintResult.
+        """
+        started = time.monotonic()
+        result = EmailOsintResult(email=email, scan_mode="deep" if deep_scan else "quick")
+        result.format_valid = self._validate_format(email)
+        if not result.format_valid:
+            yield {"event": "summary", "data": result}
+            return
+        
+        domain = email.split("@")[1].lower()
+        username = email.split("@")[0].lower()
+        result.disposable, result.free_provider = get_domain_intel_service().classify(domain)
+        
+        # MX runs alongside the site checks and is only needed for the summary
+        mx_task = asyncio.ensure_future(self._check_mx_records(domain))
+        try:
+            async for event in self._stream_social_profiles(
+                email, username, result, deep_scan, scope, extract_metadata
+            ):
+                yield event
+            result.mx_valid = await mx_task
+        finally:
+            mx_task.cancel()
+        
+        result.valid = result.format_valid and result.mx_valid
+        result.deliverable = result.valid and not result.disposable
+        result.social_count = len([p for p in result.social_profiles if p.exists])
+        self._apply_gravatar(result, email)
+        result.elapsed_seconds = round(time.monotonic() - started, 3)
+        
+        yield {"event": "summary", "data": result}
+    
+    async def stream_username(self, username: str, scope: Optional[ScanScope] = None) -> AsyncIterator[dict]:
+        """
+        Streaming username scan over the WhatsMyName catalog.
+        Same event protocol as investigate_stream(); the summary carries a
+        UsernameScanResult.
+        """
+        result = UsernameScanResult(username=username)
+        async for event in self._stream_social_profiles(None, username, result, scope=scope):
+            yield event
+        result.social_count = len(result.social_profiles)
+        yield {"event": "summary", "data": result}
+    
+    async def _stream_social_profiles(
+        self, email: Optional[str], username: str, result, deep_scan: bool = True,
+        scope: Optional[ScanScope] = None, extract_metadata: bool = True
+    ) -> AsyncIterator[dict]:
+        """
+        Run the email and username site checks as one stream, appending each
+        unique hit to result.social_profiles as it is yielded and recording
+        skipped / timed-out sites on result.
+        """
+        from .blackbird import get_blackbird_service
+        from .site_engine import get_site_check_engine, get_quick_site_check_engine, SKIPPED, UNCHECKED, TIMEOUT
+        from .site_catalog import EMAIL_CATALOG, USERNAME_CATALOG, QUICK_SCAN_SITES, FULL_SCOPE
+        from .scan_planner import ScanInput, build_plan
+        
+        blackbird_service = get_blackbird_service()
+        if blackbird_service.use_cli:
+            # The CLI only reports at the end, so emit everything in one go
+            if email:
+                profiles = await self._check_social_profiles(email, username, deep_scan, scope)
+            else:
+                hits = await blackbird_service.check_username(username, scope)
+                profiles = [self._to_social_profile(r, username) for r in hits]
+            for profile in profiles:
+                result.social_profiles.append(profile)
+                yield {"event": "profile", "data": profile}
+            return
+        
+        # One deduplicated plan covers both passes; hits are attributed back to their inputs.
+        # Quick scans only run the curated username sites, on their own pool.
+        username_scope = None if deep_scan else (scope or FULL_SCOPE).narrow(QUICK_SCAN_SITES)
+        inputs = [ScanInput("username", username, USERNAME_CATALOG, username_scope)]
+        if email:
+            inputs.insert(0, ScanInput("email", email, EMAIL_CATALOG))
+        plan = build_plan(inputs, scope)
+        
+        engine = get_site_check_engine() if deep_scan else get_quick_site_check_engine()
+        total = plan.site_count
+        checked = 0
+        seen = {}
+        # Checkpoint of checks not yet resolved, reported if the scan is cut short
+        pending = {(site.key, c.value): site for c in plan.checks for site in c.sites}
+        yield {"event": "start", "data": {
+            "query": email or username,
+            "total": total,
+            "deduplicated": plan.expanded - len(plan)
+        }}
+        
+        try:
+            async for outcome in engine.iter_checks(plan.pairs(), extract_metadata, plan.transforms):
+                pending.pop((outcome.site.key, outcome.value), None)
+                checked += 1
+                if outcome.status in UNCHECKED:
+                    unchecked = result.sites_skipped if outcome.status == SKIPPED else result.sites_failed
+                    unchecked.append(outcome.site.name)
+                else:
+                    result.sites_checked += 1
+                    if outcome.status == TIMEOUT:
+                        result.sites_timed_out.append(outcome.site.name)
+                
+                site_result = outcome.result
+                if site_result is not None:
+                    sources = plan.get(outcome.site, outcome.value).inputs
+                    if site_result.url in seen:
+                        # Same profile reached through a different request
+                        seen[site_result.url].sources.extend(s for s in sources if s not in seen[site_result.url].sources)
+                    else:
+                        profile = self._to_social_profile(site_result, username, sources)
+                        seen[site_result.url] = profile
+                        result.social_profiles.append(profile)
+                        yield {"event": "profile", "data": profile}
+                if checked % self.PROGRESS_EVERY == 0 or checked == total:
+                    yield {"event": "progress", "data": {
+                        "checked": checked,
+                        "total": total,
+                        "found": len(seen),
+                        "skipped": len(result.sites_skipped),
+                        "failed": len(result.sites_failed),
+                        "timed_out": len(result.sites_timed_out)
+                    }}
+        finally:
+            if pending:
+                result.partial = True
+                result.sites_pending = sorted({site.name for site in pending.values()})
+                result.sites_pending_keys = sorted({site.key for site in pending.values()})
+    
+    def _to_social_profile(self, site, username: str, sources: Optional[list] = None) -> SocialProfile:
+        """Map a BlackbirdResult to the SocialProfile shape the API returns."""
+        return SocialProfile(
+            platform=site.platform,
+            url=site.url,
+            username=username, # Use the scoped username variable since BlackbirdResult doesn't have it
+            exists=True,
+            category=site.category,
+            icon=site.platform.lower().replace(" ", "-"), # Helper to find icon
+            sources=list(sources or []),
+            metadata=site.metadata
+        )
+    
+    def _apply_gravatar(self, result: EmailOsintResult, email: str):
+        """
+        Use Blackbird's Gravatar result if present to populate gravatar field.
+        This keeps the frontend UI for Gravatar working if Blackbird finds it.
+        Name and avatar come from the extracted metadata, when it was requested.
+        """
+        hits = [p for p in result.social_profiles if p.platform.lower() == "gravatar" and p.exists]
+        if not hits:
+            return
+        # Both catalogs have a Gravatar entry; only the email one carries metadata rules
+        profile = next((p for p in hits if p.metadata), hits[0])
+        metadata = profile.metadata or {}
+        result.gravatar_url = profile.url
+        result.gravatar = GravatarProfile(
+            url=profile.url,
+            hash=QueryTransforms(email).get("hash-md5"),
+            display_name=metadata.get("Name"),
+            profile_url=profile.url,
+            photos=[metadata["Avatar"]] if metadata.get("Avatar") else []
+        )
+    
     def _validate_format(self, email: str) -> bool:
         """Validate email format using regex."""
         return bool(self.EMAIL_PATTERN.match(email))
     
     async def _check_mx_records(self, domain: str) -> bool:
-        """Check if domain has valid MX records."""
-        try:
-            # Run DNS query in thread pool to avoid blocking
-            loop = asyncio.get_event_loop()
-            mx_records = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None, 
-                    lambda: dns.resolver.resolve(domain, 'MX')
-                ),
-                timeout=3.0
-            )
-            return len(list(mx_records)) > 0
-        except Exception:
-            return False
+        """Check if domain can receive mail (MX records, or an A/AAAA implicit MX)."""
+        facts = await get_domain_intel_service().lookup(domain)
+        return facts.accepts_mail
     
-    async def _check_social_profiles(self, email: str, username: str, deep_scan: bool) -> List[SocialProfile]:
+    async def _check_social_profiles(
+        self, email: str, username: str, deep_scan: bool, scope: Optional[ScanScope] = None,
+        result: Optional[EmailOsintResult] = None, extract_metadata: bool = True
+    ) -> List[SocialProfile]:
         """
         Check social profiles using Blackbird.
+        With the in-process engine, per-site coverage is recorded on result.
         """
         print(f"[DEBUG] _check_social_profiles (Hybrid Scan) called for {email}, username={username}")
         from .blackbird import get_blackbird_service, BlackbirdResult
         blackbird_service = get_blackbird_service()
         
+        if not blackbird_service.use_cli and result is not None:
+            async for _ in self._stream_social_profiles(
+                email, username, result, deep_scan, scope, extract_metadata
+            ):
+                pass
+            return list(result.social_profiles)
+        
         profiles = []
         try:
             print(f"[DEBUG] Starting Blackbird scan (Email + Username) for {email}")
             
-            # Run email and username checks in parallel to maximize results
-            # We always run both to satisfy "more results" requirement
-            results_list = await asyncio.gather(
-                blackbird_service.check_email(email, deep_scan),
-                blackbird_service.check_username(username),
-                return_exceptions=True
-            )
+            # Run email and username checks in parallel to maximize results.
+            # The CLI can't be limited to the curated sites, so quick scans skip the username pass.
+            checks = [blackbird_service.check_email(email, deep_scan, scope)]
+            if deep_scan:
+                checks.append(blackbird_service.check_username(username, scope))
+            results_list = await asyncio.gather(*checks, return_exceptions=True)
             
             # Flatten results and handle exceptions
             blackbird_results = []
@@ -227,14 +462,7 @@ class EmailOsintService:
             
             # Map to SocialProfile
             for site in unique_results:
-                profiles.append(SocialProfile(
-                    platform=site.platform,
-                    url=site.url,
-                    username=username, # Use the scoped username variable since BlackbirdResult doesn't have it
-                    exists=True,
-                    category=site.category,
-                    icon=site.platform.lower().replace(" ", "-") # Helper to find icon
-                ))
+                profiles.append(self._to_social_profile(site, username))
                         
         except Exception as e:
             import traceback
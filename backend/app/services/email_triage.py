@@ -0,0 +1,120 @@
+"""
+Email Triage
+Bulk format / disposable / free-provider / MX checks for address lists, with
+no social scan. Addresses are grouped by domain so each domain is resolved
+once, domains are resolved with bounded concurrency, and rows are yielded as
+soon as their domain is known (each row carries its input position).
+
+Also runnable as a CLI:
+    python -m app.services.email_triage emails.csv > triage.ndjson
+"""
+
+import sys
+import json
+import asyncio
+import logging
+from dataclasses import dataclass, asdict
+from typing import AsyncIterator, Dict, List, Optional
+
+from ..core.config import settings
+from ..data.disposable_domains import is_disposable, is_free_provider
+from .bulk_upload import detect_format, parse_column
+from .email_osint import get_email_osint_service
+
+
+@dataclass
+class TriageRow:
+    """Checks for one input address."""
+    row: int  # 0-based position in the input
+    email: str
+    format_valid: bool = False
+    domain: Optional[str] = None
+    disposable: bool = False
+    free_provider: bool = False
+    mx_valid: bool = False
+    valid: bool = False
+    deliverable: bool = False
+
+
+class EmailTriageService:
+    """Domain-grouped bulk email checks."""
+
+    def __init__(self):
+        self.concurrency = settings.BULK_EMAIL_CONCURRENCY
+
+    async def triage(self, emails: List[str]) -> AsyncIterator[TriageRow]:
+        """Yield one TriageRow per address; malformed ones first, then by domain as each resolves."""
+        osint = get_email_osint_service()
+        by_domain: Dict[str, List[TriageRow]] = {}
+        for index, email in enumerate(emails):
+            row = TriageRow(row=index, email=email, format_valid=osint._validate_format(email))
+            if not row.format_valid:
+                yield row
+                continue
+            row.domain = email.rsplit("@", 1)[1].lower()
+            by_domain.setdefault(row.domain, []).append(row)
+
+        domains = iter(by_domain)
+        resolved: asyncio.Queue = asyncio.Queue()
+
+        async def resolve():
+            for domain in domains:
+                try:
+                    mx_valid = await osint._check_mx_records(domain)
+                except Exception as e:
+                    logging.warning(f"[EmailTriage] MX check failed for {domain}: {e}")
+                    mx_valid = False
+                await resolved.put((domain, mx_valid))
+
+        workers = [asyncio.ensure_future(resolve()) for _ in range(min(self.concurrency, len(by_domain)))]
+        try:
+            for _ in range(len(by_domain)):
+                domain, mx_valid = await resolved.get()
+                disposable, free_provider = is_disposable(domain), is_free_provider(domain)
+                for row in by_domain[domain]:
+                    row.disposable = disposable
+                    row.free_provider = free_provider
+                    row.mx_valid = mx_valid
+                    row.valid = mx_valid
+                    row.deliverable = mx_valid and not disposable
+                    yield row
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+def summarize(counts: Dict[str, int], row: TriageRow):
+    """Accumulate the per-batch counters logged with the batch."""
+    counts["rows"] = counts.get("rows", 0) + 1
+    for key in ("format_valid", "disposable", "free_provider", "mx_valid", "deliverable"):
+        if getattr(row, key):
+            counts[key] = counts.get(key, 0) + 1
+
+
+# Singleton instance
+_email_triage_service = None
+
+def get_email_triage_service() -> EmailTriageService:
+    """Get or create singleton EmailTriageService instance."""
+    global _email_triage_service
+    if _email_triage_service is None:
+        _email_triage_service = EmailTriageService()
+    return _email_triage_service
+
+
+async def _main(path: str):
+    fmt = detect_format(path, None)
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        emails = list(parse_column(f, fmt, "email"))
+    counts: Dict[str, int] = {}
+    async for row in get_email_triage_service().triage(emails):
+        summarize(counts, row)
+        sys.stdout.write(json.dumps(asdict(row)) + "\n")
+    sys.stderr.write(json.dumps(counts) + "\n")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python -m app.services.email_triage <emails.csv|emails.ndjson>")
+    asyncio.run(_main(sys.argv[1]))
@@ -0,0 +1,96 @@
+"""
+Host Scheduler
+Process-wide politeness layer in front of the site check engine: per-host
+concurrency caps, token-bucket rate limits and Retry-After back-off, shared
+by every scan running in the worker.
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from ..core.config import settings
+
+
+class _HostState:
+    """Limiter state for one host."""
+
+    __slots__ = ("semaphore", "tokens", "updated", "blocked_until")
+
+    def __init__(self, concurrency: int, burst: float):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After as seconds from now (delta-seconds or HTTP-date form)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class HostScheduler:
+    """Per-host concurrency, rate and back-off limits shared across scans."""
+
+    # Back-off used when a 429 carries no usable Retry-After
+    DEFAULT_BACKOFF = 5.0
+
+    def __init__(self):
+        self.concurrency = settings.SITE_CHECK_PER_HOST_CONCURRENCY
+        self.rate = settings.SITE_CHECK_PER_HOST_RATE
+        self.burst = float(settings.SITE_CHECK_PER_HOST_BURST)
+        self.max_retry_after = settings.SITE_CHECK_MAX_RETRY_AFTER
+        self._hosts: Dict[str, _HostState] = {}
+
+    def _state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = _HostState(self.concurrency, self.burst)
+        return state
+
+    async def _take_token(self, state: _HostState):
+        """Wait out any back-off, then take one token from the host's bucket."""
+        while True:
+            now = time.monotonic()
+            if state.blocked_until > now:
+                await asyncio.sleep(state.blocked_until - now)
+                continue
+
+            state.tokens = min(self.burst, state.tokens + (now - state.updated) * self.rate)
+            state.updated = now
+            if state.tokens >= 1:
+                state.tokens -= 1
+                return
+            await asyncio.sleep((1 - state.tokens) / self.rate)
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """Hold one of the host's concurrency slots for the duration of a request."""
+        state = self._state(host)
+        async with state.semaphore:
+            await self._take_token(state)
+            yield
+
+    def back_off(self, host: str, retry_after: Optional[str]) -> Optional[float]:
+        """
+        Block the host after a rate-limit response. Returns the delay, or None
+        when the server asks for longer than max_retry_after (not worth retrying).
+        """
+        delay = parse_retry_after(retry_after)
+        if delay is None:
+            delay = self.DEFAULT_BACKOFF
+        state = self._state(host)
+        state.blocked_until = max(state.blocked_until, time.monotonic() + min(delay, self.max_retry_after))
+        logging.info(f"[HostScheduler] {host} rate limited, backing off {delay:.1f}s")
+        return delay if delay <= self.max_retry_after else None
@@ -0,0 +1,92 @@
+"""
+Input Transforms
+Registry of the query transforms catalog entries ask for through
+`input_operation` (hashes, plus-stripping, URL-encoding), plus per-scan memos
+so each distinct transform of a query - and each strip_bad_char variant of
+it - is computed once and shared by every site that needs it.
+"""
+
+import hashlib
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import quote
+
+from .site_catalog import SiteRecord
+
+
+TRANSFORMS: Dict[str, Callable[[str], str]] = {}
+
+
+def register_transform(name: str):
+    """Decorator adding a transform under its catalog `input_operation` name."""
+    def decorator(fn: Callable[[str], str]) -> Callable[[str], str]:
+        TRANSFORMS[name] = fn
+        return fn
+    return decorator
+
+
+@register_transform("hash-sha256")
+def _hash_sha256(value: str) -> str:
+    return hashlib.sha256(value.lower().encode()).hexdigest()
+
+
+@register_transform("hash-md5")
+def _hash_md5(value: str) -> str:
+    # Gravatar's classic avatar hash
+    return hashlib.md5(value.lower().encode()).hexdigest()
+
+
+@register_transform("clean-plus")
+def _clean_plus(value: str) -> str:
+    return value.replace("+", "")
+
+
+@register_transform("url-encode")
+def _url_encode(value: str) -> str:
+    return quote(value, safe="")
+
+
+class QueryTransforms:
+    """Memoized transforms of one query value."""
+
+    __slots__ = ("value", "_values", "_accounts")
+
+    def __init__(self, value: str):
+        self.value = value
+        self._values: Dict[Optional[str], str] = {None: value}
+        self._accounts: Dict[Tuple[Optional[str], Optional[str]], str] = {}
+
+    def get(self, operation: Optional[str]) -> str:
+        """The value after one input_operation; unknown operations leave it unchanged."""
+        result = self._values.get(operation)
+        if result is None:
+            transform = TRANSFORMS.get(operation)
+            result = transform(self.value) if transform else self.value
+            self._values[operation] = result
+        return result
+
+    def account(self, site: SiteRecord) -> str:
+        """The account string substituted into a site's URL and body."""
+        key = (site.input_operation, site.strip_chars)
+        account = self._accounts.get(key)
+        if account is None:
+            account = site.account(self.get(site.input_operation))
+            self._accounts[key] = account
+        return account
+
+
+class ScanTransforms:
+    """Per-scan memo of QueryTransforms for every value the scan checks."""
+
+    __slots__ = ("_queries",)
+
+    def __init__(self):
+        self._queries: Dict[str, QueryTransforms] = {}
+
+    def query(self, value: str) -> QueryTransforms:
+        transforms = self._queries.get(value)
+        if transforms is None:
+            transforms = self._queries[value] = QueryTransforms(value)
+        return transforms
+
+    def account(self, site: SiteRecord, value: str) -> str:
+        return self.query(value).account(site)
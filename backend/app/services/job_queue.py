@@ -0,0 +1,291 @@
+"""
+Scan Job Queue
+Runs scans in the background: submissions are persisted as scan_jobs rows,
+a bounded pool of workers per API process claims and executes them, and
+progress/results are written back so any process can serve job status.
+Jobs held by a process that died are requeued once their heartbeat goes stale.
+Tokens are reserved when a job is submitted and refunded if it fails, so a
+job is billed exactly once however often it is requeued.
+"""
+
+import json
+import uuid
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.osint import OsintLog
+from ..models.scan_job import ScanJob
+from ..models.user import User
+
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class JobContext:
+    """A claimed job as seen by its handler."""
+    id: str
+    user_id: int
+    module: str
+    query: str
+    params: dict
+    attempts: int
+    report_partial: Callable[[dict], Awaitable[None]]
+
+
+# Handlers run the scan and return the final response data; the queue bills and logs it
+JobHandler = Callable[[JobContext], Awaitable[dict]]
+
+
+class ScanJobQueue:
+    """Persistent job queue with a bounded worker pool."""
+
+    def __init__(self):
+        self.workers = settings.SCAN_JOB_WORKERS
+        self.poll_interval = settings.SCAN_JOB_POLL_SECONDS
+        self.stale_after = settings.SCAN_JOB_STALE_SECONDS
+        self.max_attempts = settings.SCAN_JOB_MAX_ATTEMPTS
+        self._handlers: Dict[str, JobHandler] = {}
+        self._tasks: List[asyncio.Task] = []
+        self._active: Dict[str, asyncio.Task] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def register(self, module: str, handler: JobHandler):
+        self._handlers[module] = handler
+
+    def submit(
+        self, db: Session, user_id: int, module: str, query: str, params: Optional[dict] = None, tokens: int = 1
+    ) -> Optional[ScanJob]:
+        """
+        Reserve tokens from the user's balance and persist a new job in one
+        transaction, then wake a local worker. None when the balance is too low.
+        """
+        # Conditional update, so concurrent submissions can't overdraw the balance
+        reserved = db.query(User).filter(User.id == user_id, User.token_balance >= tokens).update(
+            {"token_balance": User.token_balance - tokens}, synchronize_session=False
+        )
+        if not reserved:
+            db.rollback()
+            return None
+        job = ScanJob(
+            id=uuid.uuid4().hex,
+            user_id=user_id,
+            module=module,
+            query=query,
+            params=json.dumps(params or {}),
+            status=QUEUED,
+            tokens=tokens
+        )
+        db.add(job)
+        db.commit()
+        db.refresh(job)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return job
+
+    def _claim_next(self) -> Optional[ScanJob]:
+        """Atomically move the oldest queued job to running; None when idle."""
+        db = SessionLocal()
+        try:
+            candidates = (
+                db.query(ScanJob.id)
+                .filter(ScanJob.status == QUEUED)
+                .order_by(ScanJob.created_at)
+                .limit(self.workers)
+                .all()
+            )
+            for (job_id,) in candidates:
+                now = _now()
+                # Conditional update, so only one process wins each job
+                claimed = db.query(ScanJob).filter(ScanJob.id == job_id, ScanJob.status == QUEUED).update(
+                    {"status": RUNNING, "started_at": now, "heartbeat_at": now, "attempts": ScanJob.attempts + 1},
+                    synchronize_session=False
+                )
+                db.commit()
+                if claimed:
+                    job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+                    db.expunge(job)
+                    return job
+            return None
+        finally:
+            db.close()
+
+    def _update(self, job_id: str, **values):
+        db = SessionLocal()
+        try:
+            db.query(ScanJob).filter(ScanJob.id == job_id).update(values, synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    def _succeed(self, job: ScanJob, result: dict):
+        """Mark the job done and log the scan it was billed for, once."""
+        db = SessionLocal()
+        try:
+            done = db.query(ScanJob).filter(ScanJob.id == job.id, ScanJob.status == RUNNING).update(
+                {"status": SUCCEEDED, "result": json.dumps(result), "finished_at": _now()}, synchronize_session=False
+            )
+            if done:
+                db.add(OsintLog(
+                    user_id=job.user_id,
+                    module=job.module,
+                    query=job.query,
+                    tokens_used=job.tokens,
+                    result=json.dumps(result)
+                ))
+            db.commit()
+        finally:
+            db.close()
+
+    def _fail(self, db: Session, job_id: str, error: str) -> bool:
+        """Move a running job to failed and refund its tokens, once (caller commits)."""
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        failed = db.query(ScanJob).filter(ScanJob.id == job_id, ScanJob.status == RUNNING).update(
+            {"status": FAILED, "error": error, "finished_at": _now()}, synchronize_session=False
+        )
+        if failed and job.tokens:
+            db.query(User).filter(User.id == job.user_id).update(
+                {"token_balance": User.token_balance + job.tokens}, synchronize_session=False
+            )
+        return bool(failed)
+
+    def _fail_and_refund(self, job_id: str, error: str):
+        db = SessionLocal()
+        try:
+            self._fail(db, job_id, error)
+            db.commit()
+        finally:
+            db.close()
+
+    def _requeue(self, job_id: str):
+        db = SessionLocal()
+        try:
+            db.query(ScanJob).filter(ScanJob.id == job_id, ScanJob.status == RUNNING).update(
+                {"status": QUEUED}, synchronize_session=False
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def _heartbeat_and_recover(self):
+        """Refresh heartbeats of local jobs and requeue (or fail) stale ones."""
+        db = SessionLocal()
+        try:
+            now = _now()
+            if self._active:
+                db.query(ScanJob).filter(ScanJob.id.in_(list(self._active))).update(
+                    {"heartbeat_at": now}, synchronize_session=False
+                )
+            stale = db.query(ScanJob.id, ScanJob.attempts).filter(
+                ScanJob.status == RUNNING,
+                ScanJob.heartbeat_at < now - timedelta(seconds=self.stale_after)
+            ).all()
+            for job_id, attempts in stale:
+                if attempts >= self.max_attempts:
+                    if self._fail(db, job_id, "Worker lost too many times"):
+                        logging.warning(f"[ScanJobQueue] Job {job_id} went stale, now {FAILED}")
+                else:
+                    db.query(ScanJob).filter(ScanJob.id == job_id, ScanJob.status == RUNNING).update(
+                        {"status": QUEUED}, synchronize_session=False
+                    )
+                    logging.warning(f"[ScanJobQueue] Job {job_id} went stale, now {QUEUED}")
+            db.commit()
+        finally:
+            db.close()
+
+    async def _execute(self, job: ScanJob):
+        handler = self._handlers.get(job.module)
+
+        async def report_partial(data: dict):
+            await asyncio.to_thread(self._update, job.id, partial=json.dumps(data), heartbeat_at=_now())
+
+        context = JobContext(
+            id=job.id,
+            user_id=job.user_id,
+            module=job.module,
+            query=job.query,
+            params=json.loads(job.params or "{}"),
+            attempts=job.attempts,
+            report_partial=report_partial
+        )
+        self._active[job.id] = asyncio.current_task()
+        try:
+            if handler is None:
+                raise ValueError(f"No handler for module {job.module!r}")
+            result = await handler(context)
+            await asyncio.to_thread(self._succeed, job, result)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back so the next process picks it up (tokens stay reserved)
+            await asyncio.to_thread(self._requeue, job.id)
+            raise
+        except Exception as e:
+            logging.error(f"[ScanJobQueue] Job {job.id} failed: {e}")
+            await asyncio.to_thread(self._fail_and_refund, job.id, str(e))
+        finally:
+            self._active.pop(job.id, None)
+
+    async def _worker(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self._claim_next)
+            except Exception as e:
+                logging.error(f"[ScanJobQueue] Claim failed: {e}")
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._execute(job)
+
+    async def _maintain(self):
+        while True:
+            try:
+                await asyncio.to_thread(self._heartbeat_and_recover)
+            except Exception as e:
+                logging.error(f"[ScanJobQueue] Heartbeat failed: {e}")
+            await asyncio.sleep(self.stale_after / 3)
+
+    def start(self):
+        """Start the worker pool (call from the app's startup hook)."""
+        if self._tasks:
+            return
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+        self._tasks.append(asyncio.ensure_future(self._maintain()))
+        logging.info(f"[ScanJobQueue] Started {self.workers} workers")
+
+    async def stop(self):
+        """Stop the workers; jobs they were running go back to the queue."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+# Singleton instance
+_scan_job_queue = None
+
+def get_scan_job_queue() -> ScanJobQueue:
+    """Get or create singleton ScanJobQueue instance."""
+    global _scan_job_queue
+    if _scan_job_queue is None:
+        _scan_job_queue = ScanJobQueue()
+    return _scan_job_queue
@@ -0,0 +1,92 @@
+"""
+Metadata Extractor
+Compiles the `metadata` rules of catalog entries (e.g. Gravatar's display
+name and avatar) once per catalog load and applies them to a response body
+the site check has already downloaded.
+"""
+
+import json
+import logging
+from typing import Any, List, Optional, Tuple
+
+# Field types defined by the Blackbird catalogs
+STRING = "String"
+IMAGE = "Image"
+ARRAY = "Array"
+
+
+def _walk(value: Any, path: Tuple) -> Any:
+    """Follow a path of dict keys / list indexes; None when it leads nowhere."""
+    for step in path:
+        if isinstance(step, int) and isinstance(value, list):
+            value = value[step] if -len(value) <= step < len(value) else None
+        elif isinstance(step, str) and isinstance(value, dict):
+            value = value.get(step)
+        else:
+            return None
+        if value is None:
+            return None
+    return value
+
+
+def _scalar(value: Any) -> Optional[str]:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    text = str(value).strip()
+    return text or None
+
+
+class MetadataField:
+    """One compiled extraction rule."""
+
+    __slots__ = ("name", "type", "path", "item_path")
+
+    def __init__(self, spec: dict):
+        self.name = spec["name"]
+        self.type = spec.get("type", STRING)
+        self.path = tuple(spec.get("path") or ())
+        self.item_path = tuple(spec.get("item-path") or ())
+
+    def extract(self, document: Any) -> Any:
+        value = _walk(document, self.path)
+        if self.type == ARRAY:
+            if not isinstance(value, list):
+                return None
+            items = [_scalar(_walk(item, self.item_path)) for item in value]
+            return [item for item in items if item is not None] or None
+        return _scalar(value)
+
+
+class MetadataExtractor:
+    """The compiled JSON metadata rules of one site."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: List[MetadataField]):
+        self.fields = tuple(fields)
+
+    def extract(self, body: bytes) -> Optional[dict]:
+        """Field name -> value for every rule that matched, or None."""
+        try:
+            document = json.loads(body)
+        except ValueError:
+            return None
+        metadata = {}
+        for field in self.fields:
+            value = field.extract(document)
+            if value is not None:
+                metadata[field.name] = value
+        return metadata or None
+
+
+def compile_metadata(specs: Optional[list], site_name: str = "") -> Optional[MetadataExtractor]:
+    """Compile a catalog entry's metadata rules; None when it has none usable."""
+    if not specs:
+        return None
+    fields = []
+    for spec in specs:
+        if spec.get("schema", "JSON") != "JSON" or "name" not in spec:
+            logging.debug(f"[MetadataExtractor] {site_name}: unsupported rule {spec}")
+            continue
+        fields.append(MetadataField(spec))
+    return MetadataExtractor(fields) if fields else None
@@ -0,0 +1,124 @@
+"""
+MX Resolver
+Async mail-exchanger lookups (dns.asyncresolver) behind a process-wide cache
+that honours record TTLs. Negative answers are cached for a shorter time,
+and domains without MX records fall back to their A/AAAA address as the
+implicit MX (RFC 5321 section 5.1).
+"""
+
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+from ..core.config import settings
+from .single_flight import SingleFlight
+
+
+@dataclass
+class MxAnswer:
+    """Where mail for a domain goes."""
+    domain: str
+    hosts: List[str] = field(default_factory=list)  # MX exchanges by preference, or the domain itself
+    implicit: bool = False  # no MX records, the A/AAAA host is the implicit MX
+    null_mx: bool = False  # RFC 7505 "MX 0 ." - the domain accepts no mail
+
+    @property
+    def accepts_mail(self) -> bool:
+        return bool(self.hosts) and not self.null_mx
+
+
+class MxResolver:
+    """TTL-honouring MX cache shared by every scan in the process."""
+
+    def __init__(self):
+        self.resolver = dns.asyncresolver.Resolver()
+        self.resolver.lifetime = settings.DNS_TIMEOUT
+        self.max_entries = settings.DNS_CACHE_MAX_ENTRIES
+        self.negative_ttl = settings.DNS_NEGATIVE_TTL
+        self.min_ttl = settings.DNS_MIN_TTL
+        self.max_ttl = settings.DNS_MAX_TTL
+        self._cache: "OrderedDict[str, Tuple[float, MxAnswer]]" = OrderedDict()
+        # Concurrent scans of the same domain share one lookup
+        self._flights = SingleFlight("mx")
+        self.hits = 0
+        self.misses = 0
+
+    def _ttl(self, ttl: int) -> float:
+        return max(self.min_ttl, min(self.max_ttl, ttl))
+
+    def _remember(self, domain: str, answer: MxAnswer, ttl: float):
+        self._cache[domain] = (time.monotonic() + ttl, answer)
+        self._cache.move_to_end(domain)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def _address_fallback(self, domain: str) -> Tuple[bool, int]:
+        """Whether the domain has an A or AAAA record, and that record's TTL."""
+        for rdtype in ("A", "AAAA"):
+            try:
+                answer = await self.resolver.resolve(domain, rdtype)
+                return True, answer.rrset.ttl
+            except (dns.resolver.NoAnswer, dns.resolver.NXDOMAIN):
+                continue
+        return False, 0
+
+    async def _lookup(self, domain: str) -> MxAnswer:
+        try:
+            answer = await self.resolver.resolve(domain, "MX")
+        except dns.resolver.NXDOMAIN:
+            result = MxAnswer(domain=domain)
+            self._remember(domain, result, self.negative_ttl)
+            return result
+        except dns.resolver.NoAnswer:
+            has_address, ttl = await self._address_fallback(domain)
+            result = MxAnswer(domain=domain, hosts=[domain] if has_address else [], implicit=has_address)
+            self._remember(domain, result, self._ttl(ttl) if has_address else self.negative_ttl)
+            return result
+
+        records = sorted(answer, key=lambda r: r.preference)
+        null_mx = len(records) == 1 and records[0].exchange.to_text() == "."
+        result = MxAnswer(
+            domain=domain,
+            hosts=[] if null_mx else [r.exchange.to_text(omit_final_dot=True) for r in records],
+            null_mx=null_mx
+        )
+        self._remember(domain, result, self._ttl(answer.rrset.ttl))
+        return result
+
+    async def resolve(self, domain: str) -> Optional[MxAnswer]:
+        """
+        Mail routing for a domain, from cache when fresh.
+        None when DNS could not be reached (timeouts are not cached).
+        """
+        domain = domain.strip().lower().rstrip(".")
+        entry = self._cache.get(domain)
+        if entry is not None:
+            if entry[0] > time.monotonic():
+                self._cache.move_to_end(domain)
+                self.hits += 1
+                return entry[1]
+            del self._cache[domain]
+
+        self.misses += 1
+        try:
+            return await self._flights.do(domain, lambda: self._lookup(domain))
+        except dns.exception.DNSException as e:
+            logging.info(f"[MxResolver] Lookup failed for {domain}: {e}")
+            return None
+
+
+# Singleton instance
+_mx_resolver = None
+
+def get_mx_resolver() -> MxResolver:
+    """Get or create singleton MxResolver instance."""
+    global _mx_resolver
+    if _mx_resolver is None:
+        _mx_resolver = MxResolver()
+    return _mx_resolver
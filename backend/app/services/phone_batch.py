@@ -0,0 +1,114 @@
+"""
+Phone Batch
+Bulk offline phone parsing for list cleansing: validity, E164/international
+formats, country, region, carrier, line type and timezone for every number,
+without the messaging-app checks. Chunks of numbers are parsed in a process
+pool so the CPU-bound phonenumbers work runs in parallel and off the event
+loop; rows are yielded in input order. Workers are spawned rather than
+forked, since forking a threaded server can copy held locks into the child.
+"""
+
+import os
+import asyncio
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import AsyncIterator, Deque, List, Optional
+
+from ..core.config import settings
+from .phone_osint import get_phone_osint_service
+from .phone_metadata import warm_up
+
+# Network-only fields of PhoneOsintResult, left out of batch rows
+MESSAGING_FIELDS = ("name", "profile_image", "whatsapp", "telegram", "signal", "viber")
+
+
+def enrich_chunk(phones: List[str]) -> List[dict]:
+    """Parse one chunk (runs in a worker process)."""
+    service = get_phone_osint_service()
+    rows = []
+    for phone in phones:
+        row = asdict(service.enrich(phone))
+        for key in MESSAGING_FIELDS:
+            del row[key]
+        rows.append(row)
+    return rows
+
+
+def _ready() -> int:
+    """No-op run once per worker at startup; returns once the worker has warmed up."""
+    return os.getpid()
+
+
+class PhoneBatchService:
+    """Process-pool phone parser."""
+
+    def __init__(self):
+        self.workers = settings.BULK_PHONE_WORKERS or os.cpu_count() or 1
+        self.chunk_size = settings.BULK_PHONE_CHUNK_SIZE
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        """
+        Spawn and warm up every parser process (call from the app's startup
+        hook, off the event loop: it blocks until the workers are ready).
+        """
+        pool = self._get_pool()
+        # The pool only spawns a process per pending task, so give each worker one
+        ready = [pool.submit(_ready) for _ in range(self.workers)]
+        pids = {future.result() for future in ready}
+        logging.info(f"[PhoneBatch] {len(pids)} parser processes ready")
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up if settings.PHONE_WARMUP else None,
+                initargs=(settings.PHONE_WARMUP_REGIONS,) if settings.PHONE_WARMUP else ()
+            )
+            logging.info(f"[PhoneBatch] Starting pool of {self.workers} parser processes")
+        return self._pool
+
+    async def parse(self, phones: List[str]) -> AsyncIterator[dict]:
+        """Yield one row per number, in input order, each with its 0-based "row" position."""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        chunks = (phones[i:i + self.chunk_size] for i in range(0, len(phones), self.chunk_size))
+        # Keep every process busy with a chunk queued behind it, without submitting the whole list up front
+        pending: Deque[asyncio.Future] = deque()
+        position = 0
+        try:
+            for chunk in chunks:
+                pending.append(loop.run_in_executor(pool, enrich_chunk, chunk))
+                if len(pending) < self.workers * 2:
+                    continue
+                for row in await pending.popleft():
+                    yield {"row": position, **row}
+                    position += 1
+            while pending:
+                for row in await pending.popleft():
+                    yield {"row": position, **row}
+                    position += 1
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def close(self):
+        """Stop the parser processes (call from the app's shutdown hook)."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+# Singleton instance
+_phone_batch_service = None
+
+def get_phone_batch_service() -> PhoneBatchService:
+    """Get or create singleton PhoneBatchService instance."""
+    global _phone_batch_service
+    if _phone_batch_service is None:
+        _phone_batch_service = PhoneBatchService()
+    return _phone_batch_service
@@ -0,0 +1,193 @@
+"""
+Phone Metadata Cache
+Country / region / timezone / carrier / line type of a number depend only on
+its country code, its number type and a leading-digit prefix no longer than
+the longest prefix phonenumbers has data for in that country code (five
+E164 digits for Indonesia). The bundle is memoized per (country code,
+prefix, number type) in a bounded LRU, so numbers from the same block are
+one dictionary hit instead of four prefix-table walks.
+
+The geocoder / carrier / timezone tables (~100 MB) are imported on first use
+rather than at module load, so warm_up() can report what loading them costs.
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import phonenumbers
+
+from ..core.config import settings
+
+
+LINE_TYPES = {
+    phonenumbers.PhoneNumberType.MOBILE: "mobile",
+    phonenumbers.PhoneNumberType.FIXED_LINE: "landline",
+    phonenumbers.PhoneNumberType.FIXED_LINE_OR_MOBILE: "mobile",
+    phonenumbers.PhoneNumberType.VOIP: "voip",
+    phonenumbers.PhoneNumberType.TOLL_FREE: "toll_free",
+    phonenumbers.PhoneNumberType.PREMIUM_RATE: "premium",
+    phonenumbers.PhoneNumberType.SHARED_COST: "shared_cost",
+    phonenumbers.PhoneNumberType.PERSONAL_NUMBER: "personal",
+    phonenumbers.PhoneNumberType.PAGER: "pager",
+    phonenumbers.PhoneNumberType.UAN: "uan",
+}
+
+
+@dataclass(frozen=True)
+class PhoneMetadata:
+    """The prefix-level facts of a number."""
+    country_name: str
+    region: str
+    timezone: str
+    carrier: str
+    line_type: str
+
+
+def _describe(parsed: phonenumbers.PhoneNumber, number_type: int) -> PhoneMetadata:
+    from phonenumbers import carrier, geocoder, timezone
+
+    try:
+        description = geocoder.description_for_number(parsed, "en")
+    except Exception:
+        description = ""
+    try:
+        tz_list = timezone.time_zones_for_number(parsed)
+        tz = tz_list[0] if tz_list else "Unknown"
+    except Exception:
+        tz = "Unknown"
+    try:
+        carrier_name = carrier.name_for_number(parsed, "en") or "Unknown"
+    except Exception:
+        carrier_name = "Unknown"
+    return PhoneMetadata(
+        country_name=description or "Unknown",
+        region=description or "Unknown",
+        timezone=tz,
+        carrier=carrier_name,
+        line_type=LINE_TYPES.get(number_type, "unknown"),
+    )
+
+
+class PhoneMetadataCache:
+    """Bounded LRU of PhoneMetadata keyed on (country code, prefix, number type)."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[Tuple[int, str, int], PhoneMetadata]" = OrderedDict()
+        # Country code -> number of E164 digits (country code included) the data tables look at
+        self._prefix_lengths: Dict[int, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.warmup: Optional[dict] = None  # report of the last warm_up()
+
+    def prefix_length(self, country_code: int) -> int:
+        length = self._prefix_lengths.get(country_code)
+        if length is None:
+            from phonenumbers.carrier import CARRIER_DATA
+            from phonenumbers.geocoder import GEOCODE_DATA
+            from phonenumbers.timezone import TIMEZONE_DATA
+
+            # Country codes are prefix-free, so every key starting with it belongs to it
+            code = str(country_code)
+            length = max(
+                (len(key) for data in (GEOCODE_DATA, CARRIER_DATA, TIMEZONE_DATA) for key in data if key.startswith(code)),
+                default=len(code)
+            )
+            self._prefix_lengths[country_code] = length
+        return length
+
+    def lookup(self, parsed: phonenumbers.PhoneNumber) -> PhoneMetadata:
+        """The metadata bundle of a parsed number, computed once per prefix."""
+        number_type = phonenumbers.number_type(parsed)
+        e164 = phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.E164)
+        key = (parsed.country_code, e164[1:1 + self.prefix_length(parsed.country_code)], number_type)
+
+        metadata = self._cache.get(key)
+        if metadata is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return metadata
+
+        self.misses += 1
+        metadata = _describe(parsed, number_type)
+        self._cache[key] = metadata
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+        return metadata
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "warmup": self.warmup,
+        }
+
+
+# Singleton instance
+_phone_metadata_cache = None
+
+def get_phone_metadata_cache() -> PhoneMetadataCache:
+    """Get or create singleton PhoneMetadataCache instance."""
+    global _phone_metadata_cache
+    if _phone_metadata_cache is None:
+        _phone_metadata_cache = PhoneMetadataCache(settings.PHONE_METADATA_CACHE_SIZE)
+    return _phone_metadata_cache
+
+
+def _rss_bytes() -> Optional[int]:
+    """Resident set size of this process, or None where /proc isn't available."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def warm_up(regions: List[str]) -> dict:
+    """
+    Load the phonenumbers metadata of the given regions and run the example
+    number of every type through parsing, validation and this cache, so the
+    first real scans in the process don't pay for it. Returns (and logs) the
+    time it took and how much the resident set grew, data imports included
+    (tracemalloc would slow the imports down a hundredfold).
+    """
+    cache = get_phone_metadata_cache()
+    started = time.perf_counter()
+    rss_before = _rss_bytes()
+    numbers = 0
+    for region in regions:
+        region = region.strip().upper()
+        if phonenumbers.country_code_for_region(region) == 0:
+            logging.warning(f"[PhoneWarmup] Unknown region {region!r}")
+            continue
+        for number_type in LINE_TYPES:
+            example = phonenumbers.example_number_for_type(region, number_type)
+            if example is None:
+                continue
+            e164 = phonenumbers.format_number(example, phonenumbers.PhoneNumberFormat.E164)
+            parsed = phonenumbers.parse(e164, None)
+            phonenumbers.is_valid_number(parsed)
+            phonenumbers.is_possible_number(parsed)
+            phonenumbers.format_number(parsed, phonenumbers.PhoneNumberFormat.INTERNATIONAL)
+            cache.lookup(parsed)
+            numbers += 1
+    rss_after = _rss_bytes()
+
+    report = {
+        "regions": regions,
+        "numbers": numbers,
+        "seconds": round(time.perf_counter() - started, 3),
+        # None where the RSS can't be read (no /proc)
+        "memory_bytes": rss_after - rss_before if rss_before is not None and rss_after is not None else None,
+    }
+    cache.warmup = report
+    logging.info(f"[PhoneWarmup] {report}")
+    return report
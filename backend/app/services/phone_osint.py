@@ -7,13 +7,16 @@ Comprehensive phone number intelligence gathering including:
 - Telegram presence check (simplified)
 """
 
+import re
 import asyncio
 import httpx
 import phonenumbers
-from phonenumbers import carrier, geocoder, timezone
 from typing import Optional
 from dataclasses import dataclass
 
+from .single_flight import SingleFlight
+from .phone_metadata import get_phone_metadata_cache
+
 
 @dataclass
 class PhoneOsintResult:
@@ -57,14 +60,23 @@ class PhoneOsintService:
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
         }
+        self._flights = SingleFlight("phone")
     
     async def investigate(self, phone: str) -> PhoneOsintResult:
         """
         Perform comprehensive phone number investigation.
+        Concurrent identical calls share one lookup and the same (read-only) result.
+        """
+        return await self._flights.do(re.sub(r"[^\d+]", "", phone), lambda: self._investigate(phone))
+    
+    def enrich(self, phone: str) -> PhoneOsintResult:
+        """
+        Everything phonenumbers can tell without network access: validity,
+        formats, country, region, timezone, carrier and line type.
         """
         result = PhoneOsintResult(phone=phone)
         
-        # Step 1: Parse and validate phone number
+        # Parse and validate phone number
         parsed = self._parse_phone(phone)
         
         if parsed is None:
@@ -84,34 +96,19 @@ class PhoneOsintService:
         result.national_number = str(parsed.national_number)
         result.country_code = f"+{parsed.country_code}"
         
-        # Get country name
-        try:
-            result.country_name = geocoder.description_for_number(parsed, "en") or "Unknown"
-        except Exception:
-            result.country_name = "Unknown"
-        
-        # Get region
-        try:
-            region = geocoder.description_for_number(parsed, "en")
-            result.region = region if region else "Unknown"
-        except Exception:
-            result.region = "Unknown"
-        
-        # Get timezone
-        try:
-            tz_list = timezone.time_zones_for_number(parsed)
-            result.timezone = tz_list[0] if tz_list else "Unknown"
-        except Exception:
-            result.timezone = "Unknown"
-        
-        # Get carrier
-        try:
-            result.carrier = carrier.name_for_number(parsed, "en") or "Unknown"
-        except Exception:
-            result.carrier = "Unknown"
+        # Country / region / timezone / carrier / line type, memoized per number prefix
+        metadata = get_phone_metadata_cache().lookup(parsed)
+        result.country_name = metadata.country_name
+        result.region = metadata.region
+        result.timezone = metadata.timezone
+        result.carrier = metadata.carrier
+        result.line_type = metadata.line_type
         
-        # Determine line type
-        result.line_type = self._get_line_type(parsed)
+        return result
+    
+    async def _investigate(self, phone: str) -> PhoneOsintResult:
+        # Step 1: Parse, validate and enrich (instant, no network)
+        result = self.enrich(phone)
         
         # Step 2: Check messaging apps using direct HTTP checks
         if result.valid:
@@ -228,28 +225,6 @@ class PhoneOsintService:
             return phonenumbers.parse(phone, None)
         except Exception:
             return None
-    
-    def _get_line_type(self, parsed: phonenumbers.PhoneNumber) -> str:
-        """Determine the line type (mobile, landline, voip)."""
-        try:
-            number_type = phonenumbers.number_type(parsed)
-            
-            type_map = {
-                phonenumbers.PhoneNumberType.MOBILE: "mobile",
-                phonenumbers.PhoneNumberType.FIXED_LINE: "landline",
-                phonenumbers.PhoneNumberType.FIXED_LINE_OR_MOBILE: "mobile",
-                phonenumbers.PhoneNumberType.VOIP: "voip",
-                phonenumbers.PhoneNumberType.TOLL_FREE: "toll_free",
-                phonenumbers.PhoneNumberType.PREMIUM_RATE: "premium",
-                phonenumbers.PhoneNumberType.SHARED_COST: "shared_cost",
-                phonenumbers.PhoneNumberType.PERSONAL_NUMBER: "personal",
-                phonenumbers.PhoneNumberType.PAGER: "pager",
-                phonenumbers.PhoneNumberType.UAN: "uan",
-            }
-            
-            return type_map.get(number_type, "unknown")
-        except Exception:
-            return "unknown"
 
 
 # Singleton instance
@@ -0,0 +1,150 @@
+"""
+Blackbird Result Retention
+Gives every Blackbird CLI run its own scratch directory and keeps the
+results/scratch folders bounded with a background age/size sweeper.
+"""
+
+import os
+import re
+import time
+import shutil
+import asyncio
+import logging
+import tempfile
+from typing import List, Optional, Set
+
+from ..core.config import settings
+
+
+def _dir_size(path: str) -> int:
+    """Total size in bytes of the files under path."""
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class ResultRetentionManager:
+    """Allocates per-run scratch directories and sweeps old result folders."""
+
+    def __init__(self, results_dir: str, run_timeout: float):
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+        # Folder Blackbird itself writes {value}_{date}_blackbird/ into
+        self.results_dir = results_dir
+        self.scratch_dir = settings.BLACKBIRD_SCRATCH_DIR or os.path.join(backend_dir, "blackbird", "runs")
+        self.max_age = settings.BLACKBIRD_RESULTS_MAX_AGE_SECONDS
+        self.max_bytes = settings.BLACKBIRD_RESULTS_MAX_BYTES
+        self.sweep_interval = settings.BLACKBIRD_SWEEP_INTERVAL_SECONDS
+        self.keep_runs = settings.BLACKBIRD_KEEP_RUN_DIRS
+        # Anything younger may belong to a run still in progress, in this process or another
+        self.run_timeout = run_timeout
+        self._active: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def new_run_dir(self, value: str) -> str:
+        """Create an isolated directory for one run; its path is fixed before the CLI starts."""
+        os.makedirs(self.scratch_dir, exist_ok=True)
+        safe = "".join(c if c.isalnum() or c in "-_.@" else "_" for c in value)[:64]
+        run_dir = tempfile.mkdtemp(prefix=f"{safe}_", dir=self.scratch_dir)
+        self._active.add(run_dir)
+        return run_dir
+
+    def claim_results(self, value: str, started_at: float, run_dir: str) -> List[str]:
+        """
+        Move the folders Blackbird wrote for value during this run into run_dir
+        and return the JSON files found there. Only folders modified after
+        started_at are taken, so output left by older runs is never returned.
+        """
+        # Exactly {value}_{MM_DD_YYYY}_blackbird, so "bob" never takes the folders of "bob_smith"
+        pattern = re.compile(rf"{re.escape(value)}_\d{{2}}_\d{{2}}_\d{{4}}_blackbird")
+        if os.path.isdir(self.results_dir):
+            for entry in os.scandir(self.results_dir):
+                if not (entry.is_dir() and pattern.fullmatch(entry.name)):
+                    continue
+                try:
+                    if entry.stat().st_mtime < started_at - 1:
+                        continue
+                    shutil.move(entry.path, os.path.join(run_dir, entry.name))
+                except OSError as e:
+                    logging.warning(f"[ResultRetention] Could not claim {entry.path}: {e}")
+
+        json_files = []
+        for root, _, files in os.walk(run_dir):
+            json_files.extend(os.path.join(root, name) for name in files if name.endswith(".json"))
+        return json_files
+
+    def release(self, run_dir: str):
+        """Mark a run as finished and drop its directory unless runs are kept for debugging."""
+        self._active.discard(run_dir)
+        if not self.keep_runs:
+            shutil.rmtree(run_dir, ignore_errors=True)
+
+    def sweep(self) -> int:
+        """
+        Delete result and scratch folders older than max_age, then the oldest
+        remaining ones until both roots fit in max_bytes. Folders modified
+        within run_timeout are never touched. Returns folders removed.
+        """
+        now = time.time()
+        entries = []
+        for root in (self.results_dir, self.scratch_dir):
+            if not os.path.isdir(root):
+                continue
+            for entry in os.scandir(root):
+                if entry.path in self._active:
+                    continue
+                try:
+                    mtime = entry.stat().st_mtime
+                    if now - mtime < self.run_timeout:
+                        continue
+                    size = _dir_size(entry.path) if entry.is_dir() else entry.stat().st_size
+                except OSError:
+                    continue
+                entries.append((mtime, size, entry.path))
+
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in entries:
+            if now - mtime < self.max_age and total <= self.max_bytes:
+                break
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+            total -= size
+            removed += 1
+
+        if removed:
+            logging.info(f"[ResultRetention] Swept {removed} result folders, {total} bytes retained")
+        return removed
+
+    async def _sweep_loop(self):
+        while True:
+            try:
+                await asyncio.to_thread(self.sweep)
+            except Exception as e:
+                logging.error(f"[ResultRetention] Sweep failed: {e}")
+            await asyncio.sleep(self.sweep_interval)
+
+    def start(self):
+        """Start the background sweeper on the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._sweep_loop())
+
+    async def stop(self):
+        """Stop the background sweeper."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
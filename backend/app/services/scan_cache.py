@@ -0,0 +1,143 @@
+"""
+Scan Result Cache
+Caches finished scan responses keyed on the normalized query, scan mode,
+scope and catalog version. An in-memory LRU sits in front of an optional
+SQLite tier that all workers on a node can share.
+"""
+
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from ..core.config import settings
+from .site_catalog import ScanScope, get_site_catalog, EMAIL_CATALOG, USERNAME_CATALOG
+
+
+def catalog_version() -> str:
+    """Combined version of the catalogs a social scan reads."""
+    if settings.BLACKBIRD_ENGINE == "cli":
+        return "cli"
+    return hashlib.sha256(
+        (get_site_catalog(EMAIL_CATALOG).version + get_site_catalog(USERNAME_CATALOG).version).encode()
+    ).hexdigest()[:16]
+
+
+class ScanResultCache:
+    """TTL + LRU cache of scan response dicts."""
+
+    def __init__(self):
+        self.ttl = settings.SCAN_CACHE_TTL_SECONDS
+        self.max_entries = settings.SCAN_CACHE_MAX_ENTRIES
+        self.sqlite_path = settings.SCAN_CACHE_SQLITE_PATH
+        self._memory: "OrderedDict[str, Tuple[float, dict]]" = OrderedDict()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, module: str, query: str, mode: str, scope: Optional[ScanScope] = None) -> str:
+        """Cache key for one scan request; changes whenever the catalogs do."""
+        parts = [module, query.strip().lower(), mode, (scope or ScanScope()).cache_key(), catalog_version()]
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._db is None:
+            self._db = sqlite3.connect(self.sqlite_path, timeout=5.0, check_same_thread=False)
+            # WAL lets several worker processes read while one writes
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS scan_cache (key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._db.commit()
+        return self._db
+
+    def _sqlite_get(self, key: str) -> Optional[Tuple[float, dict]]:
+        with self._db_lock:
+            row = self._connect().execute(
+                "SELECT value, expires_at FROM scan_cache WHERE key = ? AND expires_at > ?", (key, time.time())
+            ).fetchone()
+        return (row[1], json.loads(row[0])) if row else None
+
+    def _sqlite_set(self, key: str, value: dict, expires_at: float):
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO scan_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), expires_at),
+            )
+            db.execute("DELETE FROM scan_cache WHERE expires_at <= ?", (time.time(),))
+            db.commit()
+
+    def _sqlite_delete(self, key: Optional[str]):
+        with self._db_lock:
+            db = self._connect()
+            if key is None:
+                db.execute("DELETE FROM scan_cache")
+            else:
+                db.execute("DELETE FROM scan_cache WHERE key = ?", (key,))
+            db.commit()
+
+    def _remember(self, key: str, expires_at: float, value: dict):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[dict]:
+        """Cached response for key, or None when missing or expired."""
+        entry = self._memory.get(key)
+        if entry is not None:
+            if entry[0] > time.time():
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._memory[key]
+
+        if self.sqlite_path:
+            try:
+                entry = await asyncio.to_thread(self._sqlite_get, key)
+            except sqlite3.Error as e:
+                logging.warning(f"[ScanResultCache] SQLite read failed: {e}")
+                entry = None
+            if entry is not None:
+                self._remember(key, *entry)
+                self.hits += 1
+                return entry[1]
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: dict, ttl: Optional[float] = None):
+        expires_at = time.time() + (self.ttl if ttl is None else ttl)
+        self._remember(key, expires_at, value)
+        if self.sqlite_path:
+            try:
+                await asyncio.to_thread(self._sqlite_set, key, value, expires_at)
+            except sqlite3.Error as e:
+                logging.warning(f"[ScanResultCache] SQLite write failed: {e}")
+
+    async def invalidate(self, key: Optional[str] = None):
+        """Drop one key, or everything when key is None."""
+        if key is None:
+            self._memory.clear()
+        else:
+            self._memory.pop(key, None)
+        if self.sqlite_path:
+            await asyncio.to_thread(self._sqlite_delete, key)
+
+
+# Singleton instance
+_scan_result_cache = None
+
+def get_scan_result_cache() -> ScanResultCache:
+    """Get or create singleton ScanResultCache instance."""
+    global _scan_result_cache
+    if _scan_result_cache is None:
+        _scan_result_cache = ScanResultCache()
+    return _scan_result_cache
@@ -0,0 +1,85 @@
+"""
+Scan Checkpoints
+Partial email scans kept in the database so POST /email/resume works from
+any worker and a checkpoint is never evicted by cached scan results.
+"""
+
+import json
+import uuid
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from ..core.config import settings
+from ..core.database import SessionLocal
+from ..models.scan_checkpoint import ScanCheckpoint
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ScanCheckpointStore:
+    """Database-backed checkpoints, owned by a user and expiring after SCAN_CHECKPOINT_TTL_SECONDS."""
+
+    def __init__(self):
+        self.ttl = settings.SCAN_CHECKPOINT_TTL_SECONDS
+
+    def _save(self, user_id: int, data: dict) -> str:
+        checkpoint_id = uuid.uuid4().hex
+        now = _now()
+        db = SessionLocal()
+        try:
+            db.query(ScanCheckpoint).filter(ScanCheckpoint.expires_at <= now).delete(synchronize_session=False)
+            db.add(ScanCheckpoint(
+                id=checkpoint_id,
+                user_id=user_id,
+                data=json.dumps(data),
+                expires_at=now + timedelta(seconds=self.ttl)
+            ))
+            db.commit()
+        finally:
+            db.close()
+        return checkpoint_id
+
+    def _load(self, checkpoint_id: str, user_id: int) -> Optional[dict]:
+        db = SessionLocal()
+        try:
+            row = db.query(ScanCheckpoint).filter(
+                ScanCheckpoint.id == checkpoint_id,
+                ScanCheckpoint.user_id == user_id,
+                ScanCheckpoint.expires_at > _now()
+            ).first()
+            return json.loads(row.data) if row else None
+        finally:
+            db.close()
+
+    def _delete(self, checkpoint_id: str):
+        db = SessionLocal()
+        try:
+            db.query(ScanCheckpoint).filter(ScanCheckpoint.id == checkpoint_id).delete(synchronize_session=False)
+            db.commit()
+        finally:
+            db.close()
+
+    async def save(self, user_id: int, data: dict) -> str:
+        """Store a checkpoint and return its id."""
+        return await asyncio.to_thread(self._save, user_id, data)
+
+    async def load(self, checkpoint_id: str, user_id: int) -> Optional[dict]:
+        """The user's checkpoint, or None when missing, expired or someone else's."""
+        return await asyncio.to_thread(self._load, checkpoint_id, user_id)
+
+    async def delete(self, checkpoint_id: str):
+        await asyncio.to_thread(self._delete, checkpoint_id)
+
+
+# Singleton instance
+_scan_checkpoint_store = None
+
+def get_scan_checkpoint_store() -> ScanCheckpointStore:
+    """Get or create singleton ScanCheckpointStore instance."""
+    global _scan_checkpoint_store
+    if _scan_checkpoint_store is None:
+        _scan_checkpoint_store = ScanCheckpointStore()
+    return _scan_checkpoint_store
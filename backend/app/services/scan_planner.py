@@ -0,0 +1,95 @@
+"""
+Scan Planner
+Expands all inputs of a scan (e.g. an email and its username) over their
+catalogs into one set of unique requests, so each (method, URL, body,
+headers) is sent once and every hit can be attributed back to the inputs
+behind it. Sites that share a request (e.g. the WordPress.com variants)
+are all kept on it, and each one's rules are applied to the shared response.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from .site_catalog import ScanScope, SiteRecord, get_site_catalog
+from .input_transforms import ScanTransforms
+
+
+@dataclass
+class ScanInput:
+    """One query value and the catalog it is checked against."""
+    label: str  # e.g. "email", "username"
+    value: str
+    catalog: str
+    scope: Optional[ScanScope] = None  # overrides the plan-wide scope for this input
+
+
+@dataclass
+class PlannedCheck:
+    """A unique request in the plan, the sites evaluated on its response and the inputs behind it."""
+    site: SiteRecord  # the site whose request is sent
+    value: str
+    url: str
+    inputs: List[str] = field(default_factory=list)
+    # Other sites sending the identical request, each with its own detection rules
+    shared: List[SiteRecord] = field(default_factory=list)
+
+    @property
+    def sites(self) -> List[SiteRecord]:
+        return [self.site, *self.shared]
+
+
+class ScanPlan:
+    """Deduplicated checks for one scan."""
+
+    def __init__(self):
+        self.checks: List[PlannedCheck] = []
+        # Transformed inputs, handed on to the engine so nothing is computed twice
+        self.transforms = ScanTransforms()
+        # Site checks (one per site and input) before deduplication
+        self.expanded = 0
+        self._by_request: Dict[Tuple, PlannedCheck] = {}
+        self._by_pair: Dict[Tuple[str, str], PlannedCheck] = {}
+
+    def __len__(self):
+        """Number of requests the plan sends."""
+        return len(self.checks)
+
+    @property
+    def site_count(self) -> int:
+        """Number of site outcomes the plan produces (shared requests yield one per site)."""
+        return sum(1 + len(c.shared) for c in self.checks)
+
+    def add(self, site: SiteRecord, value: str, account: str, label: str):
+        self.expanded += 1
+        url = site.url(account)
+        request = (site.method, url, site.body(account), site.headers)
+        planned = self._by_request.get(request)
+        if planned is None:
+            planned = PlannedCheck(site=site, value=value, url=url)
+            self._by_request[request] = planned
+            self.checks.append(planned)
+        # Outcomes of a shared request carry the value it was planned with
+        if (site.key, planned.value) not in self._by_pair:
+            if planned.site is not site:
+                planned.shared.append(site)
+            self._by_pair[(site.key, planned.value)] = planned
+        if label not in planned.inputs:
+            planned.inputs.append(label)
+
+    def pairs(self) -> List[Tuple[SiteRecord, str, List[SiteRecord]]]:
+        """(site, value, shared sites) checks in the shape SiteCheckEngine.iter_checks takes."""
+        return [(c.site, c.value, c.shared) for c in self.checks]
+
+    def get(self, site: SiteRecord, value: str) -> Optional[PlannedCheck]:
+        """The planned check an engine outcome belongs to."""
+        return self._by_pair.get((site.key, value))
+
+
+def build_plan(inputs: List[ScanInput], scope: Optional[ScanScope] = None) -> ScanPlan:
+    """Expand every input over its (scoped) catalog and merge identical requests."""
+    plan = ScanPlan()
+    for scan_input in inputs:
+        for site in get_site_catalog(scan_input.catalog).select(scan_input.scope or scope):
+            account = plan.transforms.account(site, scan_input.value)
+            plan.add(site, scan_input.value, account, scan_input.label)
+    return plan
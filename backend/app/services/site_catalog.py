@@ -0,0 +1,405 @@
+"""
+Site Catalog
+Compiles the Blackbird / WhatsMyName site definitions in app/data once into
+compact records (pre-split templates, pre-encoded match strings, enums) with
+name/category/host indexes, and caches the compiled catalog in a binary file
+keyed on the source file hash so worker boot skips JSON parsing.
+"""
+
+import os
+import sys
+import json
+import stat
+import getpass
+import pickle
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass, replace
+from enum import IntEnum
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from ..core.config import settings
+from .metadata_extractor import MetadataExtractor, compile_metadata
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
+
+USERNAME_CATALOG = "wmn-data.json"
+EMAIL_CATALOG = "blackbird_email_data.json"
+PHONE_CATALOG = "blackbird_phone_data.json"
+
+# Bump when SiteRecord/SiteCatalog change shape so stale cache files are ignored
+CATALOG_FORMAT_VERSION = 5
+
+PLACEHOLDER = "{account}"
+
+# Curated high-signal username sites checked by quick scans; deep scans use the whole catalog.
+# Popular platforms with reliable detection rules and no bot protection.
+QUICK_SCAN_SITES = frozenset(name.lower() for name in (
+    "GitHub", "GitLab", "Reddit", "Instagram", "X", "TikTok", "Twitch", "Medium",
+    "Pinterest", "Steam", "Keybase", "Telegram", "Facebook", "Vimeo", "SoundCloud",
+    "Patreon", "Linktree", "npm", "pypi", "Flickr", "Dribbble", "tumblr", "VK",
+    "Snapchat", "Substack", "Kaggle", "LeetCode", "Replit", "Chess.com", "about.me",
+    "Gravatar", "Quora", "Etsy", "DeviantArt", "Imgur", "HackerOne",
+))
+
+
+class HttpMethod(IntEnum):
+    GET = 0
+    POST = 1
+    HEAD = 2
+    PUT = 3
+
+
+def _split(template: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """Pre-split a template on the account placeholder."""
+    if template is None:
+        return None
+    return tuple(sys.intern(part) for part in template.split(PLACEHOLDER))
+
+
+def _encode(value: Optional[str]) -> Optional[bytes]:
+    return value.encode("utf-8") if value else None
+
+
+class SiteRecord:
+    """One compiled catalog entry."""
+
+    __slots__ = (
+        "index", "key", "name", "category", "category_id", "method", "host",
+        "url_parts", "pretty_parts", "body_parts", "headers",
+        "e_code", "e_string", "m_code", "m_string",
+        "strip_chars", "strip_table", "input_operation", "extractor", "pre_check",
+        "known", "protection",
+    )
+
+    def __init__(self, catalog: str, index: int, entry: dict, category_id: int):
+        self.index = index
+        self.name = sys.intern(entry.get("name", "Unknown"))
+        # Unique across catalogs (the same site name can appear in several)
+        self.key = f"{catalog}:{self.name}"
+        self.category = sys.intern(entry.get("cat") or "unknown")
+        self.category_id = category_id
+
+        # A few catalog URLs carry stray whitespace (e.g. Habbo), which httpx rejects
+        uri_check = entry["uri_check"].strip()
+        body = entry.get("post_body") or entry.get("data")
+        method = (entry.get("method") or ("POST" if body else "GET")).upper()
+        self.method = HttpMethod[method]
+        self.url_parts = _split(uri_check)
+        self.pretty_parts = _split((entry.get("uri_pretty") or "").strip() or uri_check)
+        self.body_parts = _split(body)
+        self.host = _host_key(uri_check)
+        self.headers = tuple((entry.get("headers") or {}).items())
+
+        self.e_code = entry.get("e_code")
+        self.m_code = entry.get("m_code")
+        self.e_string = _encode(entry.get("e_string"))
+        self.m_string = _encode(entry.get("m_string"))
+
+        self.strip_chars = entry.get("strip_bad_char") or None
+        self.strip_table = str.maketrans("", "", self.strip_chars) if self.strip_chars else None
+        self.input_operation = entry.get("input_operation")
+        # Compiled metadata rules, applied to the body of a hit when requested
+        self.extractor: Optional[MetadataExtractor] = compile_metadata(entry.get("metadata"), self.name)
+        self.pre_check = entry.get("pre_check")
+        self.known = tuple(entry.get("known") or ())
+        self.protection = tuple(entry.get("protection") or ())
+
+    def account(self, value: str) -> str:
+        """Apply strip_bad_char to an (already transformed) query value."""
+        return value.translate(self.strip_table) if self.strip_table else value
+
+    def url(self, account: str) -> str:
+        return account.join(self.url_parts)
+
+    def pretty_url(self, account: str) -> str:
+        return account.join(self.pretty_parts)
+
+    def body(self, account: str) -> Optional[bytes]:
+        return account.join(self.body_parts).encode("utf-8") if self.body_parts else None
+
+    @property
+    def needs_body(self) -> bool:
+        """False when the status code alone decides the check."""
+        return bool(self.e_string or self.m_string)
+
+    def matches(self, status: int, body: bytes) -> bool:
+        """Apply the detection rules to a fully read response body."""
+        e_found = not self.e_string or self.e_string in body
+        m_found = bool(self.m_string) and self.m_string in body
+        return self.decide(status, e_found, m_found)
+
+    def decide(self, status: int, e_found: bool, m_found: bool) -> bool:
+        """
+        Apply the Blackbird detection rules.
+        A hit needs the existence code (and string, when defined) and must not
+        look like the site's "missing account" page.
+        """
+        if status != self.e_code or not e_found or m_found:
+            return False
+        if self.m_code == self.e_code:
+            # Status cannot tell the pages apart, the strings above already decided
+            return True
+        return status != self.m_code
+
+    def __repr__(self):
+        return f"SiteRecord({self.name!r}, {self.category!r})"
+
+
+class BodyMatcher:
+    """
+    Incremental e_string/m_string search over a streamed body. Only a tail
+    as long as the longest needle is kept between chunks, so matches that
+    straddle a chunk boundary are still found without buffering the page.
+    """
+
+    __slots__ = ("site", "e_found", "m_found", "bytes_read", "_tail", "_keep")
+
+    def __init__(self, site: SiteRecord):
+        self.site = site
+        self.e_found = not site.e_string
+        self.m_found = False
+        self.bytes_read = 0
+        self._tail = b""
+        self._keep = max(len(site.e_string or b""), len(site.m_string or b"")) - 1
+
+    @property
+    def decided(self) -> bool:
+        """True once more body cannot change the outcome."""
+        return self.m_found or (self.e_found and not self.site.m_string)
+
+    def feed(self, chunk: bytes) -> bool:
+        """Scan one chunk; returns decided."""
+        self.bytes_read += len(chunk)
+        data = self._tail + chunk
+        if not self.e_found and self.site.e_string in data:
+            self.e_found = True
+        if self.site.m_string and self.site.m_string in data:
+            self.m_found = True
+        self._tail = data[-self._keep:] if self._keep > 0 else b""
+        return self.decided
+
+    def result(self, status: int) -> bool:
+        return self.site.decide(status, self.e_found, self.m_found)
+
+
+def _host_key(uri: str) -> str:
+    """Hostname of a URL template with account-dependent labels removed."""
+    host = urlsplit(uri.replace(PLACEHOLDER, "x")).hostname or ""
+    if uri.split("//", 1)[-1].startswith(PLACEHOLDER):
+        host = host.split(".", 1)[-1]
+    return host.lower()
+
+
+@dataclass(frozen=True)
+class ScanScope:
+    """
+    Which sites a scan may touch: an optional category include list, a
+    category exclude list and an optional explicit site allow-list (names).
+    site_keys further limits it to exact SiteRecord keys ("catalog:name"),
+    which is how a resumed scan re-runs only the checks it left pending.
+    """
+    include_categories: Optional[Tuple[str, ...]] = None
+    exclude_categories: Tuple[str, ...] = ()
+    sites: Optional[Tuple[str, ...]] = None
+    site_keys: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def build(cls, include=None, exclude=None, sites=None, site_keys=None) -> "ScanScope":
+        return cls(
+            include_categories=tuple(include) if include else None,
+            exclude_categories=tuple(exclude or ()),
+            sites=tuple(s.lower() for s in sites) if sites else None,
+            site_keys=tuple(site_keys) if site_keys is not None else None,
+        )
+
+    def cache_key(self) -> str:
+        """Order-insensitive string form, for use in cache keys."""
+        include = ",".join(sorted(self.include_categories)) if self.include_categories is not None else "*"
+        sites = ",".join(sorted(self.sites)) if self.sites is not None else "*"
+        key = f"{include}|{','.join(sorted(self.exclude_categories))}|{sites}"
+        if self.site_keys is not None:
+            key += "|" + ",".join(sorted(self.site_keys))
+        return key
+
+    def narrow(self, sites: Iterable[str]) -> "ScanScope":
+        """This scope further limited to the given site names."""
+        names = {s.lower() for s in sites}
+        if self.sites is not None:
+            names &= set(self.sites)
+        return replace(self, sites=tuple(sorted(names)))
+
+    @property
+    def is_full(self) -> bool:
+        return (
+            self.include_categories is None and not self.exclude_categories
+            and self.sites is None and self.site_keys is None
+        )
+
+    def allows(self, name: str, category: str) -> bool:
+        """Whether a site passes the scope (used where the catalog index is not available)."""
+        if self.sites is not None and name.lower() not in self.sites:
+            return False
+        if self.include_categories is not None and category not in self.include_categories:
+            return False
+        return category not in self.exclude_categories
+
+
+FULL_SCOPE = ScanScope()
+
+
+class SiteCatalog:
+    """A compiled catalog with lookup indexes."""
+
+    def __init__(self, name: str, version: str, data: dict):
+        self.name = name
+        # Source file hash, also usable as a cache key for scan results
+        self.version = version
+        self.categories: List[str] = sorted({s.get("cat") or "unknown" for s in data.get("sites", [])})
+        category_ids = {c: i for i, c in enumerate(self.categories)}
+
+        self.sites: List[SiteRecord] = []
+        for entry in data.get("sites", []):
+            try:
+                record = SiteRecord(name, len(self.sites), entry, category_ids[entry.get("cat") or "unknown"])
+            except (KeyError, ValueError) as e:
+                logging.warning(f"[SiteCatalog] Skipping malformed entry {entry.get('name')}: {e}")
+                continue
+            self.sites.append(record)
+
+        self.by_name: Dict[str, SiteRecord] = {s.name.lower(): s for s in self.sites}
+        by_category: Dict[str, List[int]] = {}
+        by_host: Dict[str, List[int]] = {}
+        for s in self.sites:
+            by_category.setdefault(s.category, []).append(s.index)
+            by_host.setdefault(s.host, []).append(s.index)
+        self.by_category: Dict[str, Tuple[int, ...]] = {k: tuple(v) for k, v in by_category.items()}
+        self.by_host: Dict[str, Tuple[int, ...]] = {k: tuple(v) for k, v in by_host.items()}
+
+    def __len__(self):
+        return len(self.sites)
+
+    def get(self, name: str) -> Optional[SiteRecord]:
+        return self.by_name.get(name.lower())
+
+    def in_category(self, category: str) -> List[SiteRecord]:
+        return [self.sites[i] for i in self.by_category.get(category, ())]
+
+    def on_host(self, host: str) -> List[SiteRecord]:
+        return [self.sites[i] for i in self.by_host.get(host.lower(), ())]
+
+    def select(self, scope: Optional[ScanScope] = None) -> List[SiteRecord]:
+        """Resolve a scope against the indexes, keeping catalog order."""
+        if scope is None or scope.is_full:
+            return self.sites
+
+        if scope.site_keys is not None:
+            prefix = f"{self.name}:"
+            names = (k[len(prefix):].lower() for k in scope.site_keys if k.startswith(prefix))
+            indexes = {self.by_name[n].index for n in names if n in self.by_name}
+        elif scope.sites is not None:
+            indexes = {self.by_name[n].index for n in scope.sites if n in self.by_name}
+        elif scope.include_categories is not None:
+            indexes = {i for c in scope.include_categories for i in self.by_category.get(c, ())}
+        else:
+            indexes = range(len(self.sites))
+
+        return [
+            s for s in (self.sites[i] for i in sorted(indexes))
+            if scope.allows(s.name, s.category)
+        ]
+
+
+def _owned_privately(st: os.stat_result) -> bool:
+    """Owned by this user and not writable by anyone else (anything else could feed pickle.load).
+
+    Windows has no owner in stat() and reports every writable file as 0o666, so
+    there we rely on the default cache living under the per-user %TEMP%.
+    """
+    if sys.platform == "win32":
+        return True
+    if st.st_uid != os.getuid():
+        return False
+    return not st.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+
+
+def _cache_dir() -> Optional[str]:
+    """The compiled catalog cache directory, or None when it isn't private to this user."""
+    user = os.getuid() if hasattr(os, "getuid") else getpass.getuser()
+    path = settings.SITE_CATALOG_CACHE_DIR or os.path.join(tempfile.gettempdir(), f"blackeagle-catalog-{user}")
+    try:
+        os.makedirs(path, mode=0o700, exist_ok=True)
+        st = os.lstat(path)
+    except OSError as e:
+        logging.warning(f"[SiteCatalog] No catalog cache at {path}: {e}")
+        return None
+    if not stat.S_ISDIR(st.st_mode) or not _owned_privately(st):
+        logging.warning(f"[SiteCatalog] Not using catalog cache {path}: not a private directory of this user")
+        return None
+    return path
+
+
+def _load_cached(cache_file: str, version: str) -> Optional[SiteCatalog]:
+    """The cached catalog, unpickled only if the file is a regular file private to this user."""
+    try:
+        fd = os.open(cache_file, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logging.warning(f"[SiteCatalog] Ignoring unreadable cache {cache_file}: {e}")
+        return None
+    with os.fdopen(fd, "rb") as f:
+        st = os.fstat(f.fileno())
+        if not stat.S_ISREG(st.st_mode) or not _owned_privately(st):
+            logging.warning(f"[SiteCatalog] Ignoring cache {cache_file}: not a private file of this user")
+            return None
+        try:
+            catalog = pickle.load(f)
+        except Exception as e:
+            logging.warning(f"[SiteCatalog] Ignoring unreadable cache {cache_file}: {e}")
+            return None
+    return catalog if isinstance(catalog, SiteCatalog) and catalog.version == version else None
+
+
+def _compile(name: str) -> SiteCatalog:
+    """Load a catalog from its binary cache, compiling and caching it on a miss."""
+    path = os.path.join(DATA_DIR, name)
+    with open(path, "rb") as f:
+        raw = f.read()
+    version = hashlib.sha256(raw).hexdigest()
+    cache_dir = _cache_dir()
+    if cache_dir is None:
+        return SiteCatalog(name, version, json.loads(raw))
+    cache_file = os.path.join(cache_dir, f"{name}.{CATALOG_FORMAT_VERSION}.{version[:16]}.pickle")
+
+    catalog = _load_cached(cache_file, version)
+    if catalog is not None:
+        return catalog
+
+    catalog = SiteCatalog(name, version, json.loads(raw))
+    try:
+        # Write then rename so concurrently booting workers never read a partial file (mkstemp creates it 0600)
+        fd, tmp = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(catalog, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+        for stale in os.listdir(cache_dir):
+            if stale.startswith(f"{name}.") and stale != os.path.basename(cache_file):
+                os.remove(os.path.join(cache_dir, stale))
+    except OSError as e:
+        logging.warning(f"[SiteCatalog] Could not write cache {cache_file}: {e}")
+    logging.info(f"[SiteCatalog] Compiled {len(catalog)} sites from {name}")
+    return catalog
+
+
+_catalogs: Dict[str, SiteCatalog] = {}
+
+def get_site_catalog(name: str) -> SiteCatalog:
+    """Get or load the compiled catalog for one data file."""
+    catalog = _catalogs.get(name)
+    if catalog is None:
+        catalog = _catalogs[name] = _compile(name)
+    return catalog
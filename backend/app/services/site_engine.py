@@ -0,0 +1,365 @@
+"""
+Site Check Engine - In-process Implementation
+Evaluates the Blackbird / WhatsMyName site definitions shipped in app/data
+directly on the event loop, sharing one HTTP connection pool between scans.
+"""
+
+import time
+import asyncio
+import logging
+from dataclasses import dataclass
+from http.cookiejar import CookieJar, DefaultCookiePolicy
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+import httpx
+
+from ..core.config import settings
+from .blackbird import BlackbirdResult
+from .host_scheduler import HostScheduler
+from .input_transforms import ScanTransforms
+from .site_health import SiteHealthTracker
+from .site_catalog import BodyMatcher, HttpMethod, ScanScope, SiteRecord, get_site_catalog, USERNAME_CATALOG, EMAIL_CATALOG, PHONE_CATALOG
+
+
+# Check outcome statuses
+FOUND = "found"
+NOT_FOUND = "not_found"
+TIMEOUT = "timeout"
+ERROR = "error"
+SKIPPED = "skipped"  # circuit breaker open
+RATE_LIMITED = "rate_limited"  # still rate limited after the allowed retries, or Retry-After too long
+
+# Outcomes that say nothing about whether the account exists
+UNCHECKED = frozenset((SKIPPED, RATE_LIMITED, ERROR))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+}
+
+
+@dataclass
+class CheckOutcome:
+    """How one (site, value) check resolved."""
+    site: SiteRecord
+    value: str
+    status: str
+    result: Optional[BlackbirdResult] = None
+    elapsed: float = 0.0
+    bytes_read: int = 0
+
+
+class SiteCheckEngine:
+    """Runs catalog site checks concurrently over a shared httpx pool."""
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        max_connections: Optional[int] = None,
+        max_timeout: Optional[float] = None,
+        scheduler: Optional[HostScheduler] = None,
+        health: Optional[SiteHealthTracker] = None,
+    ):
+        # transport is only overridden by tooling (e.g. the offline catalog self-test)
+        self.transport = transport
+        max_connections = max_connections or settings.SITE_CHECK_MAX_CONNECTIONS
+        # Upper bound on the adaptive per-site timeout
+        self.max_timeout = max_timeout or settings.SITE_CHECK_TIMEOUT
+        self.timeout = httpx.Timeout(self.max_timeout, connect=min(5.0, self.max_timeout))
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections // 2,
+        )
+        self.scan_concurrency = settings.SITE_CHECK_SCAN_CONCURRENCY
+        self.max_body_bytes = settings.SITE_CHECK_MAX_BODY_BYTES
+        self.head_probes = settings.SITE_CHECK_HEAD_PROBES
+        self.rate_limit_retries = settings.SITE_CHECK_RATE_LIMIT_RETRIES
+        # One scheduler per process so concurrent scans share host budgets
+        self.scheduler = scheduler or HostScheduler()
+        self.health = health or SiteHealthTracker()
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get or create the pooled client shared by every scan in this process."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=self.limits,
+                headers=DEFAULT_HEADERS,
+                follow_redirects=False,  # 3xx codes are part of the detection rules
+                transport=self.transport,
+                # Never persist cookies: the pool is shared by unrelated scans
+                cookies=CookieJar(policy=DefaultCookiePolicy(allowed_domains=[])),
+            )
+        return self._client
+
+    async def check_email(self, email: str, scope: Optional[ScanScope] = None) -> List[BlackbirdResult]:
+        """Check the email-specific catalog, limited to the sites in scope."""
+        return await self._run(get_site_catalog(EMAIL_CATALOG).select(scope), email)
+
+    async def check_username(self, username: str, scope: Optional[ScanScope] = None) -> List[BlackbirdResult]:
+        """Check the WhatsMyName username catalog, limited to the sites in scope."""
+        return await self._run(get_site_catalog(USERNAME_CATALOG).select(scope), username)
+
+    async def check_phone(self, phone: str) -> List[BlackbirdResult]:
+        """Check the phone catalog."""
+        return await self._run(get_site_catalog(PHONE_CATALOG).sites, phone)
+
+    async def _run(self, sites: List[SiteRecord], value: str) -> List[BlackbirdResult]:
+        """Check every site for one value and return the hits."""
+        results = []
+        async for outcome in self.iter_checks([(site, value) for site in sites]):
+            if outcome.result is not None:
+                results.append(outcome.result)
+        logging.info(f"[SiteCheckEngine] {len(results)}/{len(sites)} sites matched for {value}")
+        return results
+
+    async def iter_checks(
+        self, checks: Sequence[tuple], extract_metadata: bool = False,
+        transforms: Optional[ScanTransforms] = None
+    ) -> AsyncIterator[CheckOutcome]:
+        """
+        Run (site, value) checks concurrently and yield a CheckOutcome as each
+        one resolves, whatever its status. A check may also be given as
+        (site, value, shared_sites): the shared sites send the identical
+        request, so it is sent once and each site's own rules are applied to
+        the response, yielding one outcome per site. Closing the iterator early
+        cancels whatever is still in flight. With extract_metadata, hits on sites
+        that define metadata rules carry the extracted fields in result.metadata.
+        transforms lets a caller that already shaped the inputs (the scan planner) share its memo.
+        """
+        client = self._get_client()
+        semaphore = asyncio.Semaphore(self.scan_concurrency)
+        transforms = transforms or ScanTransforms()
+
+        async def bounded(site: SiteRecord, value: str, shared: Sequence[SiteRecord]) -> List[CheckOutcome]:
+            async with semaphore:
+                return await self._check_site(client, site, value, transforms, extract_metadata, shared)
+
+        tasks = [
+            asyncio.ensure_future(bounded(check[0], check[1], check[2] if len(check) > 2 else ()))
+            for check in checks
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for outcome in await next_done:
+                    yield outcome
+        finally:
+            for task in tasks:
+                task.cancel()
+            # Wait for the cancelled checks so their host slots are released before returning
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _check_site(
+        self, client: httpx.AsyncClient, site: SiteRecord, value: str, transforms: ScanTransforms,
+        extract_metadata: bool = False, shared: Sequence[SiteRecord] = ()
+    ) -> List[CheckOutcome]:
+        """
+        Send one site's request and apply its detection rules, and those of
+        any shared sites, to the response. Health is tracked on the site that
+        owns the request.
+        """
+        sites = [site, *shared]
+        outcomes = [CheckOutcome(site=s, value=value, status=NOT_FOUND) for s in sites]
+
+        def finish(status: str, elapsed: float = 0.0) -> List[CheckOutcome]:
+            for outcome in outcomes:
+                outcome.status = status
+                outcome.elapsed = elapsed
+            return outcomes
+
+        if not self.health.allow(site.key):
+            return finish(SKIPPED)
+        account = transforms.account(site, value)
+        headers = dict(site.headers)
+
+        # Metadata is read from the same response, so those checks need its body
+        keep_body = extract_metadata and any(s.extractor is not None for s in sites)
+        method = site.method
+        if method == HttpMethod.GET and self.head_probes and not keep_body and not any(s.needs_body for s in sites):
+            method = HttpMethod.HEAD
+
+        timeout = min(self.max_timeout, self.health.timeout_for(site.key))
+        found: Optional[List[bool]] = None
+        body = None
+        elapsed = 0.0
+        bytes_read = 0
+        try:
+            for _ in range(self.rate_limit_retries + 1):
+                async with self.scheduler.slot(site.host):
+                    started = time.monotonic()
+                    found, delay, bytes_read, body = await asyncio.wait_for(
+                        self._request(client, sites, method, account, headers, keep_body), timeout
+                    )
+                    elapsed = time.monotonic() - started
+                # The back-off is enforced by the scheduler on the next slot
+                if found is not None or delay is None:
+                    break
+        except asyncio.CancelledError:
+            # A cancelled half-open probe must not keep the site skipped
+            self.health.release(site.key)
+            raise
+        except asyncio.TimeoutError:
+            self.health.record_failure(site.key, timed_out_after=timeout)
+            return finish(TIMEOUT, timeout)
+        except Exception as e:
+            logging.debug(f"[SiteCheckEngine] {site.name} failed: {e}")
+            self.health.record_failure(site.key)
+            return finish(ERROR)
+
+        if found is None:
+            # The site never answered the question; neither healthy nor failing
+            self.health.release(site.key)
+            return finish(RATE_LIMITED, elapsed)
+
+        self.health.record_success(site.key, elapsed)
+        for outcome, site_found in zip(outcomes, found):
+            outcome.elapsed = elapsed
+            outcome.bytes_read = bytes_read
+            if not site_found:
+                continue
+            hit = outcome.site
+            outcome.status = FOUND
+            outcome.result = BlackbirdResult(
+                platform=hit.name,
+                url=hit.pretty_url(transforms.account(hit, value)),
+                exists=True,
+                category=hit.category,
+                metadata=hit.extractor.extract(body) if body and hit.extractor else None,
+            )
+        return outcomes
+
+    async def _request(
+        self, client: httpx.AsyncClient, sites: List[SiteRecord], method: HttpMethod, account: str, headers: dict,
+        keep_body: bool = False
+    ) -> Tuple[Optional[List[bool]], Optional[float], int, Optional[bytes]]:
+        """
+        One attempt of sites[0]'s request, its pre-check included: returns
+        (found per site, retry_delay, body_bytes_read, body). found is None
+        when the host rate limited us, with retry_delay set if the request is
+        worth repeating; body is only kept for hits when keep_body is set.
+        """
+        site = sites[0]
+        if site.pre_check:
+            values = await self._pre_check(client, site.pre_check)
+            headers = {name: _fill(template, values) for name, template in headers.items()}
+        async with client.stream(
+            method.name,
+            site.url(account),
+            headers=headers,
+            content=site.body(account),
+        ) as response:
+            if self._is_rate_limited(sites, response):
+                return None, self.scheduler.back_off(site.host, response.headers.get("Retry-After")), 0, None
+            found, bytes_read, body = await self._match_response(sites, response, keep_body)
+            return found, None, bytes_read, body
+
+    def _is_rate_limited(self, sites: List[SiteRecord], response: httpx.Response) -> bool:
+        """429, or 503 with Retry-After, unless one of the sites uses that code in its own rules."""
+        status = response.status_code
+        if any(status in (site.e_code, site.m_code) for site in sites):
+            return False
+        return status == 429 or (status == 503 and "Retry-After" in response.headers)
+
+    async def _match_response(
+        self, sites: List[SiteRecord], response: httpx.Response, keep_body: bool = False
+    ) -> Tuple[List[bool], int, Optional[bytes]]:
+        """
+        Decide each site's check while streaming the body: stop as soon as the
+        status rules them out, the match strings settle them, or max_body_bytes
+        have been read. Leaving the stream early simply drops that connection.
+        With keep_body, the rest of a hit's body (up to max_body_bytes) is read
+        for metadata. Returns (found per site, body bytes read, body or None).
+        """
+        status = response.status_code
+        matchers = [BodyMatcher(site) if status == site.e_code else None for site in sites]
+        active = [m for m in matchers if m is not None]
+        if not active:
+            return [False] * len(sites), 0, None
+
+        if response.request.method == "HEAD":
+            return [m.result(status) if m else False for m in matchers], 0, None
+
+        body = bytearray() if keep_body else None
+        bytes_read = 0
+        chunks = response.aiter_bytes()
+        if not all(m.decided for m in active):
+            async for chunk in chunks:
+                bytes_read += len(chunk)
+                if body is not None:
+                    body += chunk
+                decided = [m.feed(chunk) for m in active]
+                if all(decided) or bytes_read >= self.max_body_bytes:
+                    break
+        found = [m.result(status) if m else False for m in matchers]
+        if not any(found) or body is None:
+            return found, bytes_read, None
+
+        async for chunk in chunks:
+            if len(body) >= self.max_body_bytes:
+                break
+            body += chunk
+        return found, len(body), bytes(body)
+
+    async def _pre_check(self, client: httpx.AsyncClient, pre_check: dict) -> dict:
+        """
+        Fetch the token some sites require (e.g. a CSRF cookie) before the real
+        check. Returns the values for the site's header placeholders: cookie
+        "csrftoken" fills {csrftoken_value}. Raises ValueError when the token
+        is missing, rather than sending the placeholder.
+        """
+        response = await client.request(
+            pre_check.get("method") or "GET",
+            pre_check["endpoint"],
+            headers=pre_check.get("headers") or None,
+        )
+        values = {}
+        if pre_check.get("type") == "cookie":
+            name = pre_check.get("cookie_name")
+            token = response.cookies.get(name)
+            if not token:
+                raise ValueError(f"pre-check set no {name} cookie (HTTP {response.status_code})")
+            values[f"{name}_value"] = token
+        return values
+
+    async def aclose(self):
+        """Close the shared connection pool."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+def _fill(template: str, values: dict) -> str:
+    """Substitute {name} placeholders (other braces, e.g. in JSON, are left alone)."""
+    for name, value in values.items():
+        template = template.replace(f"{{{name}}}", value)
+    return template
+
+
+# Singleton instance
+_site_check_engine = None
+
+def get_site_check_engine() -> SiteCheckEngine:
+    """Get or create singleton SiteCheckEngine instance."""
+    global _site_check_engine
+    if _site_check_engine is None:
+        _site_check_engine = SiteCheckEngine()
+    return _site_check_engine
+
+
+# Quick scans get their own smaller pool and tighter timeouts, but share
+# host politeness limits with the main engine (site health is tracked separately)
+_quick_site_check_engine = None
+
+def get_quick_site_check_engine() -> SiteCheckEngine:
+    """Get or create the SiteCheckEngine used by quick scans."""
+    global _quick_site_check_engine
+    if _quick_site_check_engine is None:
+        engine = get_site_check_engine()
+        _quick_site_check_engine = SiteCheckEngine(
+            max_connections=settings.QUICK_SCAN_MAX_CONNECTIONS,
+            max_timeout=settings.QUICK_SCAN_SITE_TIMEOUT,
+            scheduler=engine.scheduler,
+            # Timeouts under the quick cap say little about a site, so they must not open deep-scan breakers
+            health=SiteHealthTracker(default_timeout=settings.QUICK_SCAN_SITE_TIMEOUT),
+        )
+    return _quick_site_check_engine
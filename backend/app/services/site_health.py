@@ -0,0 +1,142 @@
+"""
+Site Health Tracker
+Rolling latency and error statistics per catalog site, used to derive
+per-site timeouts and to trip circuit breakers on sites that keep failing.
+"""
+
+import time
+import math
+import logging
+from collections import deque
+from typing import Dict, Optional
+
+from ..core.config import settings
+
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class SiteStats:
+    """Latency window and breaker state for one site."""
+
+    __slots__ = (
+        "latencies", "successes", "failures", "consecutive_failures",
+        "state", "opened_at", "probing", "_timeout",
+    )
+
+    def __init__(self, window: int):
+        self.latencies = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probing = False
+        self._timeout: Optional[float] = None
+
+    def percentile(self, q: float) -> float:
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1)]
+
+
+class SiteHealthTracker:
+    """Adaptive timeouts and circuit breakers keyed by SiteRecord.key."""
+
+    # Samples needed before the observed latency replaces the default timeout
+    MIN_SAMPLES = 5
+
+    def __init__(self, default_timeout: Optional[float] = None):
+        self.default_timeout = default_timeout or settings.SITE_CHECK_TIMEOUT
+        self.min_timeout = settings.SITE_CHECK_MIN_TIMEOUT
+        self.percentile = settings.SITE_CHECK_TIMEOUT_PERCENTILE
+        self.margin = settings.SITE_CHECK_TIMEOUT_MARGIN
+        self.failure_threshold = settings.SITE_BREAKER_FAILURES
+        self.cooldown = settings.SITE_BREAKER_COOLDOWN
+        self.window = settings.SITE_CHECK_LATENCY_WINDOW
+        self._sites: Dict[str, SiteStats] = {}
+
+    def _stats(self, key: str) -> SiteStats:
+        stats = self._sites.get(key)
+        if stats is None:
+            stats = self._sites[key] = SiteStats(self.window)
+        return stats
+
+    def timeout_for(self, key: str) -> float:
+        """High percentile of recent latencies times 1.5 plus a margin, within [min, default]."""
+        stats = self._stats(key)
+        if stats._timeout is None:
+            if len(stats.latencies) < self.MIN_SAMPLES:
+                stats._timeout = self.default_timeout
+            else:
+                observed = stats.percentile(self.percentile) * 1.5 + self.margin
+                stats._timeout = max(self.min_timeout, min(self.default_timeout, observed))
+        return stats._timeout
+
+    def allow(self, key: str) -> bool:
+        """
+        False while the breaker is open. After the cooldown one half-open probe
+        is let through; its outcome closes or re-opens the breaker.
+        """
+        stats = self._stats(key)
+        if stats.state == CLOSED:
+            return True
+        if stats.state == OPEN and time.monotonic() - stats.opened_at >= self.cooldown:
+            stats.state = HALF_OPEN
+        if stats.state == HALF_OPEN and not stats.probing:
+            stats.probing = True
+            return True
+        return False
+
+    def record_success(self, key: str, latency: float):
+        stats = self._stats(key)
+        stats.latencies.append(latency)
+        stats._timeout = None
+        stats.successes += 1
+        stats.consecutive_failures = 0
+        stats.probing = False
+        if stats.state != CLOSED:
+            logging.info(f"[SiteHealth] {key} recovered, closing breaker")
+            stats.state = CLOSED
+
+    def record_failure(self, key: str, timed_out_after: Optional[float] = None):
+        """
+        timed_out_after is the timeout a request ran into: the site's latency
+        was at least that, so it goes into the window as a (censored) sample
+        and a slowing site gets a longer timeout instead of timing out forever.
+        """
+        stats = self._stats(key)
+        if timed_out_after is not None:
+            stats.latencies.append(timed_out_after)
+            stats._timeout = None
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        stats.probing = False
+        if stats.state == HALF_OPEN or stats.consecutive_failures >= self.failure_threshold:
+            if stats.state != OPEN:
+                logging.info(f"[SiteHealth] {key} failing, opening breaker for {self.cooldown}s")
+            stats.state = OPEN
+            stats.opened_at = time.monotonic()
+
+    def release(self, key: str):
+        """
+        End a check without a verdict (cancelled, rate limited). A half-open
+        probe gives its slot back so the next check probes instead.
+        """
+        self._stats(key).probing = False
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Per-site statistics for diagnostics."""
+        return {
+            key: {
+                "state": s.state,
+                "samples": len(s.latencies),
+                "p50": s.percentile(0.5) if s.latencies else None,
+                "timeout": self.timeout_for(key),
+                "successes": s.successes,
+                "failures": s.failures,
+            }
+            for key, s in self._sites.items()
+        }
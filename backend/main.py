@@ -1,3 +1,4 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.api import api_router
@@ -6,7 +7,7 @@ from app.core.config import settings
 from app.core.config import settings
 from app.core.database import engine, Base
 # Import all models to ensure they are registered
-from app.models import User, OsintLog, Transaction
+from app.models import User, OsintLog, Transaction, ScanJob, DomainIntel, ScanCheckpoint
 
 # Create tables
 Base.metadata.create_all(bind=engine)
@@ -24,6 +25,46 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def startup():
+    # Background scan workers (POST /osint/email|phone with background=true)
+    from app.services.job_queue import get_scan_job_queue
+    get_scan_job_queue().start()
+    # External domain lists are compiled and mapped off the event loop, then watched for changes
+    from app.services.domain_index import get_domain_index
+    (await asyncio.to_thread(get_domain_index)).start()
+    # Most-looked-up domains answer from memory without touching DNS
+    from app.services.domain_intel import get_domain_intel_service
+    await get_domain_intel_service().preload()
+    if settings.PHONE_WARMUP:
+        # First phone scans otherwise pay for loading phonenumbers region metadata
+        from app.services.phone_metadata import warm_up
+        await asyncio.to_thread(warm_up, settings.PHONE_WARMUP_REGIONS)
+    # Bulk phone parser processes, spawned and warmed before request threads are busy
+    from app.services.phone_batch import get_phone_batch_service
+    await asyncio.to_thread(get_phone_batch_service().start)
+    if settings.BLACKBIRD_ENGINE == "cli":
+        # Keep blackbird/results and the per-run scratch folders bounded
+        from app.services.blackbird import get_blackbird_service
+        get_blackbird_service().retention.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Running jobs go back to the queue for the next process
+    from app.services.job_queue import get_scan_job_queue
+    await get_scan_job_queue().stop()
+    from app.services.domain_index import get_domain_index
+    await get_domain_index().stop()
+    # Release the shared site check connection pool
+    from app.services.site_engine import get_site_check_engine, get_quick_site_check_engine
+    await get_site_check_engine().aclose()
+    await get_quick_site_check_engine().aclose()
+    from app.services.phone_batch import get_phone_batch_service
+    get_phone_batch_service().close()
+    if settings.BLACKBIRD_ENGINE == "cli":
+        from app.services.blackbird import get_blackbird_service
+        await get_blackbird_service().retention.stop()
+
 @app.get("/")
 def root():
     return {"message": "BlackEagle OSINT API is running"}
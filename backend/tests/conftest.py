@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+
+# Run from backend/ or the repo root: the app package lives next to this folder
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# A file, not :memory:, so sessions opened in worker threads see the same database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/blackeagle.db")
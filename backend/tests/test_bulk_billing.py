@@ -0,0 +1,94 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.api.endpoints import osint
+from app.core.database import Base, SessionLocal, engine
+from app.models import OsintLog, User
+from app.services.email_triage import EmailTriageService
+
+
+def _client(balance):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    user = User(email=f"bulk{balance}-{id(db)}@example.com", hashed_password="x", token_balance=balance)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    db.close()
+
+    app = FastAPI()
+    app.include_router(osint.router, prefix="/osint")
+    app.dependency_overrides[deps.get_current_user] = lambda: user
+    return TestClient(app), user.id
+
+
+def _balance_and_logs(user_id):
+    db = SessionLocal()
+    try:
+        balance = db.query(User).filter(User.id == user_id).first().token_balance
+        return balance, db.query(OsintLog).filter(OsintLog.user_id == user_id).count()
+    finally:
+        db.close()
+
+
+def _upload(client, path):
+    return client.post(path, files={"file": ("list.csv", "email\nalice@example.com\nbob@\n", "text/csv")})
+
+
+def test_bulk_email_is_charged_before_streaming(monkeypatch):
+    client, user_id = _client(1)
+    charged_before_rows = []
+
+    async def triage(self, emails):
+        charged_before_rows.append(_balance_and_logs(user_id))
+        for row in []:
+            yield row
+
+    monkeypatch.setattr(EmailTriageService, "triage", triage)
+    response = _upload(client, "/osint/email/bulk")
+
+    assert response.status_code == 200
+    assert charged_before_rows == [(0, 1)]
+
+
+def test_bulk_email_failure_is_refunded(monkeypatch):
+    client, user_id = _client(1)
+
+    async def triage(self, emails):
+        raise RuntimeError("resolver down")
+        yield
+
+    monkeypatch.setattr(EmailTriageService, "triage", triage)
+    try:
+        _upload(client, "/osint/email/bulk")
+    except RuntimeError:
+        pass
+
+    assert _balance_and_logs(user_id)[0] == 1
+
+
+def test_bulk_email_needs_the_tokens():
+    client, user_id = _client(0)
+
+    assert _upload(client, "/osint/email/bulk").status_code == 402
+    assert _balance_and_logs(user_id) == (0, 0)
+
+
+def test_bulk_phone_is_charged_before_streaming(monkeypatch):
+    from app.services.phone_batch import PhoneBatchService
+
+    client, user_id = _client(1)
+    charged_before_rows = []
+
+    async def parse(self, phones):
+        charged_before_rows.append(_balance_and_logs(user_id))
+        for row in []:
+            yield row
+
+    monkeypatch.setattr(PhoneBatchService, "parse", parse)
+    response = client.post("/osint/phone/bulk", files={"file": ("list.csv", "phone\n+6281234567890\n", "text/csv")})
+
+    assert response.status_code == 200
+    assert charged_before_rows == [(0, 1)]
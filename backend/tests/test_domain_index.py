@@ -0,0 +1,40 @@
+import os
+
+from app.services.domain_index import DomainList
+
+
+def test_lookups_never_recompile_and_refresh_swaps_the_list(tmp_path):
+    source = tmp_path / "disposable.txt"
+    source.write_text("throwaway.test\n")
+    domains = DomainList("disposable", [], str(source))
+
+    assert domains.matches("mail.throwaway.test")
+
+    source.write_text("throwaway.test\nburner.test\n")
+    stamp = os.stat(source).st_mtime + 5
+    os.utime(source, (stamp, stamp))
+
+    assert not domains.matches("burner.test")
+    domains.refresh()
+    assert domains.matches("burner.test")
+
+
+def test_source_copied_with_an_older_mtime_is_recompiled(tmp_path):
+    source = tmp_path / "disposable.txt"
+    source.write_text("throwaway.test\n")
+    DomainList("disposable", [], str(source))
+
+    # cp -p / rsync -t: new contents, mtime older than the existing .idx
+    source.write_text("throwaway.test\nburner.test\n")
+    os.utime(source, (1_000_000_000, 1_000_000_000))
+
+    assert DomainList("disposable", [], str(source)).matches("burner.test")
+
+
+def test_index_header_is_not_a_key(tmp_path):
+    source = tmp_path / "disposable.txt"
+    source.write_text("a.test\nb.test\nc.test\n")
+    domains = DomainList("disposable", [], str(source))
+
+    assert all(domains.matches(d) for d in ("a.test", "b.test", "c.test"))
+    assert not domains.matches("source")
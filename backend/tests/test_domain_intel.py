@@ -0,0 +1,33 @@
+import asyncio
+import time
+
+from app.services.domain_intel import DomainFacts, DomainIntelService
+
+
+def test_lookup_counts_are_bounded():
+    service = DomainIntelService()
+    service.max_entries = 3
+
+    for domain in ("a.test", "b.test", "a.test", "c.test", "d.test"):
+        service._count_lookup(domain)
+
+    assert dict(service._lookups) == {"a.test": 2, "c.test": 1, "d.test": 1}
+
+
+def test_background_refresh_is_referenced_until_done():
+    service = DomainIntelService()
+    refreshed = asyncio.Event()
+
+    async def refresh(facts):
+        refreshed.set()
+
+    service._refresh = refresh
+
+    async def serve_stale():
+        service._serve(DomainFacts(domain="example.test", checked_at=time.time() - service.ttl - 1))
+        assert len(service._refresh_tasks) == 1
+        await refreshed.wait()
+        await asyncio.sleep(0)
+
+    asyncio.run(serve_stale())
+    assert not service._refresh_tasks
@@ -0,0 +1,55 @@
+import asyncio
+
+from app.core.config import settings
+from app.services.email_osint import EmailOsintService
+
+
+def _investigate(monkeypatch, mx_seconds):
+    service = EmailOsintService()
+
+    async def mx(domain):
+        await asyncio.sleep(mx_seconds)
+        return True
+
+    async def social(*args):
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(service, "_check_mx_records", mx)
+    monkeypatch.setattr(service, "_check_social_profiles", social)
+    monkeypatch.setattr(settings, "QUICK_SCAN_DEADLINE_SECONDS", 0.1)
+    return asyncio.run(service._investigate("alice@example.com"))
+
+
+def test_deadline_keeps_finished_mx_result(monkeypatch):
+    result = _investigate(monkeypatch, 0)
+
+    assert result.partial
+    assert result.mx_valid is True
+    assert result.valid is True
+
+
+def test_deadline_leaves_unfinished_mx_unknown(monkeypatch):
+    result = _investigate(monkeypatch, 5)
+
+    assert result.partial
+    assert result.mx_valid is None
+    assert result.valid is None
+    assert result.deliverable is None
+
+
+def test_shared_scan_returns_the_normalized_email(monkeypatch):
+    service = EmailOsintService()
+    scans = []
+
+    async def investigate(email, *args):
+        scans.append(email)
+        await asyncio.sleep(0.05)
+        return email
+
+    monkeypatch.setattr(service, "_investigate", investigate)
+
+    async def both():
+        return await asyncio.gather(service.investigate(" Alice@Example.com"), service.investigate("alice@example.COM"))
+
+    assert asyncio.run(both()) == ["alice@example.com", "alice@example.com"]
+    assert scans == ["alice@example.com"]
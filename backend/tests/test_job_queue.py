@@ -0,0 +1,82 @@
+import asyncio
+
+from app.core.database import Base, SessionLocal, engine
+from app.models import OsintLog, ScanJob, User
+from app.services.job_queue import FAILED, QUEUED, SUCCEEDED, ScanJobQueue
+
+
+def _setup(balance):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    # Workers claim the oldest queued job, so start from an empty queue
+    db.query(ScanJob).delete()
+    user = User(email=f"user{balance}-{id(db)}@example.com", hashed_password="x", token_balance=balance)
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    return db, user.id
+
+
+def _state(user_id, job_id):
+    db = SessionLocal()
+    try:
+        balance = db.query(User).filter(User.id == user_id).first().token_balance
+        job = db.query(ScanJob).filter(ScanJob.id == job_id).first()
+        logs = db.query(OsintLog).filter(OsintLog.user_id == user_id).count()
+        return balance, job.status, logs
+    finally:
+        db.close()
+
+
+def _run(queue, handler):
+    queue.register("email", handler)
+
+    async def claim_and_execute():
+        job = await asyncio.to_thread(queue._claim_next)
+        await queue._execute(job)
+
+    asyncio.run(claim_and_execute())
+
+
+def test_submit_reserves_tokens():
+    db, user_id = _setup(1)
+    queue = ScanJobQueue()
+
+    assert queue.submit(db, user_id, "email", "alice@example.com") is not None
+    assert queue.submit(db, user_id, "email", "alice@example.com") is None
+    db.close()
+
+
+def test_requeued_job_is_billed_once():
+    db, user_id = _setup(3)
+    queue = ScanJobQueue()
+    job_id = queue.submit(db, user_id, "email", "alice@example.com").id
+    db.close()
+
+    async def cancelled(job):
+        raise asyncio.CancelledError()
+
+    try:
+        _run(queue, cancelled)
+    except asyncio.CancelledError:
+        pass
+    assert _state(user_id, job_id) == (2, QUEUED, 0)
+
+    async def succeeded(job):
+        return {"email": job.query}
+
+    _run(queue, succeeded)
+    assert _state(user_id, job_id) == (2, SUCCEEDED, 1)
+
+
+def test_failed_job_is_refunded():
+    db, user_id = _setup(1)
+    queue = ScanJobQueue()
+    job_id = queue.submit(db, user_id, "email", "alice@example.com").id
+    db.close()
+
+    async def failing(job):
+        raise RuntimeError("boom")
+
+    _run(queue, failing)
+    assert _state(user_id, job_id) == (1, FAILED, 0)
@@ -0,0 +1,23 @@
+import asyncio
+
+from app.services.phone_batch import PhoneBatchService
+
+
+def test_spawned_pool_parses_in_order():
+    service = PhoneBatchService()
+    service.workers = 2
+    service.chunk_size = 1
+    service.start()
+    assert service._pool._mp_context.get_start_method() == "spawn"
+    assert len(service._pool._processes) == 2
+
+    async def parse():
+        return [row async for row in service.parse(["+6281234567890", "not a number", "+14155552671"])]
+
+    try:
+        rows = asyncio.run(parse())
+    finally:
+        service.close()
+
+    assert [row["row"] for row in rows] == [0, 1, 2]
+    assert [row["valid"] for row in rows] == [True, False, True]
@@ -0,0 +1,24 @@
+import os
+import subprocess
+import sys
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# A fresh interpreter, so the data tables aren't already imported by other tests
+WARM_UP = """
+import sys
+from app.services.phone_metadata import warm_up
+assert "phonenumbers.geocoder" not in sys.modules
+report = warm_up(["ID"])
+assert "phonenumbers.geocoder" in sys.modules
+print(report["memory_bytes"])
+"""
+
+
+def test_warm_up_measures_loading_the_data_tables():
+    out = subprocess.run([sys.executable, "-c", WARM_UP], cwd=BACKEND, capture_output=True, text=True, check=True)
+
+    memory = out.stdout.strip()
+    if sys.platform.startswith("linux"):
+        # The geocoder / carrier / timezone tables alone are tens of MB
+        assert int(memory) > 10_000_000
@@ -0,0 +1,45 @@
+import os
+import time
+
+from app.services.result_retention import ResultRetentionManager
+
+
+def _manager(tmp_path, **settings):
+    manager = ResultRetentionManager(str(tmp_path / "results"), run_timeout=60)
+    manager.scratch_dir = str(tmp_path / "runs")
+    for key, value in settings.items():
+        setattr(manager, key, value)
+    os.makedirs(manager.results_dir)
+    return manager
+
+
+def _folder(manager, name, age=0.0):
+    path = os.path.join(manager.results_dir, name)
+    os.makedirs(path)
+    with open(os.path.join(path, "result.json"), "w") as f:
+        f.write("{}")
+    stamp = time.time() - age
+    os.utime(path, (stamp, stamp))
+    return path
+
+
+def test_claim_takes_only_the_exact_value(tmp_path):
+    manager = _manager(tmp_path)
+    _folder(manager, "bob_10_17_2026_blackbird")
+    _folder(manager, "bob_smith_10_17_2026_blackbird")
+    run_dir = manager.new_run_dir("bob")
+
+    files = manager.claim_results("bob", time.time() - 5, run_dir)
+
+    assert [os.path.basename(os.path.dirname(f)) for f in files] == ["bob_10_17_2026_blackbird"]
+    assert os.path.isdir(os.path.join(manager.results_dir, "bob_smith_10_17_2026_blackbird"))
+
+
+def test_sweep_leaves_folders_of_running_scans(tmp_path):
+    manager = _manager(tmp_path, max_age=0, max_bytes=0)
+    old = _folder(manager, "alice_10_16_2026_blackbird", age=3600)
+    young = _folder(manager, "bob_10_17_2026_blackbird", age=5)
+
+    assert manager.sweep() == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(young)
@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+
+from app.api.endpoints import osint
+from app.core.config import settings
+from app.services import site_engine
+from app.services.email_osint import EmailOsintService
+from app.services.scan_cache import get_scan_result_cache
+from app.services.site_catalog import FULL_SCOPE
+
+
+def _deep_scan_twice(monkeypatch, handler):
+    engine = site_engine.SiteCheckEngine(transport=httpx.MockTransport(handler))
+    engine.rate_limit_retries = 0
+    monkeypatch.setattr(site_engine, "_site_check_engine", engine)
+    monkeypatch.setattr(settings, "SCAN_CACHE_SQLITE_PATH", "")
+
+    async def accepts_mail(self, domain):
+        return True
+
+    monkeypatch.setattr(EmailOsintService, "_check_mx_records", accepts_mail)
+
+    async def scan():
+        await get_scan_result_cache().invalidate()
+        try:
+            first = await osint._email_scan("alice@example.com", True, FULL_SCOPE, False)
+            second = await osint._email_scan("alice@example.com", True, FULL_SCOPE, False)
+        finally:
+            await engine.aclose()
+        return first, second
+
+    return asyncio.run(scan())
+
+
+def test_deep_scan_with_a_few_gaps_is_cached(monkeypatch):
+    def handler(request):
+        if request.url.host == "www.habbo.com":
+            return httpx.Response(429, headers={"Retry-After": "3600"})
+        # The cookie answers the pre-checks of sites that need a CSRF token
+        return httpx.Response(404, headers={"Set-Cookie": "csrftoken=abc123"}, text="not found")
+
+    first, second = _deep_scan_twice(monkeypatch, handler)
+
+    assert first["sites_failed"] == ["Habbo.com"]
+    assert not first["cached"]
+    assert second["cached"]
+
+
+def test_deep_scan_with_many_gaps_is_not_cached(monkeypatch):
+    def handler(request):
+        raise httpx.ConnectError("connection refused", request=request)
+
+    first, second = _deep_scan_twice(monkeypatch, handler)
+
+    assert len(first["sites_failed"]) > settings.SCAN_CACHE_MAX_MISSES
+    assert not second["cached"]
@@ -0,0 +1,34 @@
+import asyncio
+
+from app.core.database import Base, engine
+from app.models import ScanCheckpoint  # noqa: F401 (registers the table)
+from app.services.scan_checkpoint import ScanCheckpointStore
+from app.services.site_catalog import ScanScope, get_site_catalog, EMAIL_CATALOG, USERNAME_CATALOG
+
+
+def test_checkpoint_is_kept_per_user():
+    Base.metadata.create_all(bind=engine)
+    store = ScanCheckpointStore()
+
+    async def roundtrip():
+        checkpoint_id = await store.save(1, {"email": "alice@example.com"})
+        mine = await store.load(checkpoint_id, 1)
+        theirs = await store.load(checkpoint_id, 2)
+        await store.delete(checkpoint_id)
+        return mine, theirs, await store.load(checkpoint_id, 1)
+
+    mine, theirs, deleted = asyncio.run(roundtrip())
+
+    assert mine == {"email": "alice@example.com"}
+    assert theirs is None
+    assert deleted is None
+
+
+def test_pending_keys_select_one_catalog():
+    email_catalog = get_site_catalog(EMAIL_CATALOG)
+    username_catalog = get_site_catalog(USERNAME_CATALOG)
+    gravatar = email_catalog.by_name["gravatar"]
+    scope = ScanScope.build(site_keys=[gravatar.key])
+
+    assert email_catalog.select(scope) == [gravatar]
+    assert username_catalog.select(scope) == []
@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+
+from app.services.scan_planner import ScanPlan
+from app.services.site_catalog import SiteRecord
+from app.services.site_engine import FOUND, NOT_FOUND, SiteCheckEngine
+
+
+URL = "https://api.example.test/sites/{account}"
+
+
+def _site(index, name, **rules):
+    return SiteRecord("test.json", index, {"name": name, "uri_check": URL, "cat": "blog", **rules}, 0)
+
+
+PUBLIC = _site(0, "Example (Public)", e_code=200, e_string='"ID":', m_string='"error":"unknown_blog"', m_code=404)
+PRIVATE = _site(1, "Example (Private)", e_code=403, e_string='"message":"private"', m_string='"error":"unknown_blog"', m_code=404)
+
+
+def _plan(*sites):
+    plan = ScanPlan()
+    for site in sites:
+        plan.add(site, "alice", plan.transforms.account(site, "alice"), "username")
+    return plan
+
+
+def _run(plan, handler):
+    engine = SiteCheckEngine(transport=httpx.MockTransport(handler))
+
+    async def collect():
+        try:
+            return {o.site.name: o async for o in engine.iter_checks(plan.pairs(), transforms=plan.transforms)}
+        finally:
+            await engine.aclose()
+
+    return asyncio.run(collect())
+
+
+def test_sites_sharing_a_request_are_all_planned():
+    plan = _plan(PUBLIC, PRIVATE)
+
+    assert len(plan) == 1
+    assert plan.site_count == 2
+    assert plan.get(PRIVATE, "alice") is plan.checks[0]
+
+
+def test_shared_request_applies_each_sites_rules():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(403, text='{"message":"private"}')
+
+    outcomes = _run(_plan(PUBLIC, PRIVATE), handler)
+
+    assert len(requests) == 1
+    assert outcomes["Example (Private)"].status == FOUND
+    assert outcomes["Example (Public)"].status == NOT_FOUND
+
+
+def test_shared_request_other_site_matches():
+    outcomes = _run(_plan(PUBLIC, PRIVATE), lambda request: httpx.Response(200, text='{"ID": 7}'))
+
+    assert outcomes["Example (Public)"].status == FOUND
+    assert outcomes["Example (Private)"].status == NOT_FOUND
+
@@ -0,0 +1,30 @@
+import os
+import sys
+
+from app.services.site_catalog import SiteRecord, _owned_privately, get_site_catalog, USERNAME_CATALOG
+
+
+def test_catalog_urls_are_stripped():
+    site = SiteRecord("test.json", 0, {
+        "name": "Habbo", "uri_check": " https://www.habbo.test/api/users?name={account}",
+        "uri_pretty": " https://www.habbo.test/profile/{account} ", "cat": "gaming",
+        "e_code": 200, "e_string": "uniqueId",
+    }, 0)
+
+    assert site.host == "www.habbo.test"
+    assert site.url("alice") == "https://www.habbo.test/api/users?name=alice"
+    assert site.pretty_url("alice") == "https://www.habbo.test/profile/alice"
+
+
+def test_bundled_habbo_urls_are_usable():
+    habbo = get_site_catalog(USERNAME_CATALOG).by_name["habbo.com"]
+
+    assert habbo.url("alice").startswith("https://")
+
+
+def test_windows_cache_ignores_mode_bits(monkeypatch):
+    st = os.stat_result((0o100666, 0, 0, 1, 0, 0, 0, 0, 0, 0))
+    assert not _owned_privately(st)
+
+    monkeypatch.setattr(sys, "platform", "win32")
+    assert _owned_privately(st)
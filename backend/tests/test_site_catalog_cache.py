@@ -0,0 +1,40 @@
+import os
+import pickle
+
+from app.core.config import settings
+from app.services import site_catalog
+from app.services.site_catalog import EMAIL_CATALOG
+
+
+def _use_cache_dir(monkeypatch, path):
+    monkeypatch.setattr(settings, "SITE_CATALOG_CACHE_DIR", str(path))
+
+
+def test_compiled_catalog_is_cached_privately(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "cache"
+    _use_cache_dir(monkeypatch, cache_dir)
+
+    compiled = site_catalog._compile(EMAIL_CATALOG)
+    [cache_file] = os.listdir(cache_dir)
+
+    assert os.stat(cache_dir).st_mode & 0o777 == 0o700
+    assert os.stat(cache_dir / cache_file).st_mode & 0o077 == 0
+    assert site_catalog._load_cached(str(cache_dir / cache_file), compiled.version) is not None
+
+
+def test_shared_cache_dir_is_not_used(monkeypatch, tmp_path):
+    tmp_path.chmod(0o777)
+    _use_cache_dir(monkeypatch, tmp_path)
+
+    assert site_catalog._cache_dir() is None
+    assert len(site_catalog._compile(EMAIL_CATALOG)) > 0
+    assert os.listdir(tmp_path) == []
+
+
+def test_writable_cache_file_is_not_unpickled(monkeypatch, tmp_path):
+    cache_file = tmp_path / "catalog.pickle"
+    cache_file.write_bytes(pickle.dumps(object()))
+    cache_file.chmod(0o666)
+    monkeypatch.setattr(site_catalog.pickle, "load", lambda f: (_ for _ in ()).throw(AssertionError("unpickled")))
+
+    assert site_catalog._load_cached(str(cache_file), "v") is None
@@ -0,0 +1,55 @@
+import asyncio
+
+import httpx
+
+from app.services.site_catalog import get_site_catalog, EMAIL_CATALOG
+from app.services.site_engine import ERROR, FOUND, TIMEOUT, SiteCheckEngine
+
+
+def _check_eventbrite(handler, **engine_args):
+    eventbrite = get_site_catalog(EMAIL_CATALOG).by_name["eventbrite"]
+    engine = SiteCheckEngine(transport=httpx.MockTransport(handler), **engine_args)
+
+    async def collect():
+        try:
+            return [o async for o in engine.iter_checks([(eventbrite, "alice@example.com")])]
+        finally:
+            await engine.aclose()
+
+    [outcome] = asyncio.run(collect())
+    return outcome
+
+
+def test_pre_check_token_fills_the_header_templates():
+    checks = []
+
+    def handler(request):
+        if request.method == "GET":
+            return httpx.Response(200, headers={"Set-Cookie": "csrftoken=abc123; Path=/"})
+        checks.append(request.headers)
+        return httpx.Response(200, text='{"exists":true}')
+
+    assert _check_eventbrite(handler).status == FOUND
+    assert checks[0]["cookie"] == "csrftoken=abc123"
+    assert checks[0]["x-csrftoken"] == "abc123"
+
+
+def test_missing_pre_check_token_is_an_error():
+    checks = []
+
+    def handler(request):
+        if request.method == "GET":
+            return httpx.Response(200)
+        checks.append(request)
+        return httpx.Response(200, text='{"exists":true}')
+
+    assert _check_eventbrite(handler).status == ERROR
+    assert not checks
+
+
+def test_slow_pre_check_counts_against_the_site_timeout():
+    async def handler(request):
+        await asyncio.sleep(5)
+        return httpx.Response(200, headers={"Set-Cookie": "csrftoken=abc123; Path=/"})
+
+    assert _check_eventbrite(handler, max_timeout=0.2).status == TIMEOUT
@@ -0,0 +1,54 @@
+import asyncio
+
+import httpx
+
+from app.services.site_catalog import SiteRecord
+from app.services.site_engine import RATE_LIMITED, SiteCheckEngine
+
+
+SITE = SiteRecord("test.json", 0, {
+    "name": "Example", "uri_check": "https://example.test/{account}", "cat": "social",
+    "e_code": 200, "e_string": "profile", "m_code": 404, "m_string": "not found",
+}, 0)
+
+
+def _check(handler, retries=1):
+    engine = SiteCheckEngine(transport=httpx.MockTransport(handler))
+    engine.rate_limit_retries = retries
+
+    async def collect():
+        try:
+            return [o async for o in engine.iter_checks([(SITE, "alice")])]
+        finally:
+            await engine.aclose()
+
+    outcomes = asyncio.run(collect())
+    return engine, outcomes
+
+
+def test_rate_limited_past_retries_is_not_a_miss():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(429, headers={"Retry-After": "0"})
+
+    engine, [outcome] = _check(handler, retries=2)
+
+    assert len(requests) == 3
+    assert outcome.status == RATE_LIMITED
+    assert engine.health.snapshot().get(SITE.key, {}).get("successes", 0) == 0
+
+
+def test_retry_after_too_long_is_not_a_miss():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(429, headers={"Retry-After": "3600"})
+
+    engine, [outcome] = _check(handler)
+
+    assert len(requests) == 1
+    assert outcome.status == RATE_LIMITED
+    assert engine.health.snapshot().get(SITE.key, {}).get("successes", 0) == 0
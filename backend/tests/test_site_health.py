@@ -0,0 +1,71 @@
+import asyncio
+
+import httpx
+
+from app.services.site_catalog import SiteRecord
+from app.services.site_engine import SiteCheckEngine
+from app.services.site_health import HALF_OPEN, SiteHealthTracker
+
+
+SITE = SiteRecord("test.json", 0, {
+    "name": "Example", "uri_check": "https://example.test/{account}", "cat": "social",
+    "e_code": 200, "e_string": "profile", "m_code": 404, "m_string": "not found",
+}, 0)
+
+
+def _half_open(tracker, key):
+    for _ in range(tracker.failure_threshold):
+        tracker.record_failure(key)
+    tracker._sites[key].opened_at -= tracker.cooldown
+    assert tracker.allow(key)
+    assert tracker._sites[key].state == HALF_OPEN
+
+
+def test_cancelled_probe_is_released():
+    async def handler(request):
+        await asyncio.sleep(60)
+
+    engine = SiteCheckEngine(transport=httpx.MockTransport(handler))
+    _half_open(engine.health, SITE.key)
+    engine.health.release(SITE.key)
+
+    async def cancel_probe():
+        async def scan():
+            return [o async for o in engine.iter_checks([(SITE, "alice")])]
+
+        try:
+            task = asyncio.create_task(scan())
+            await asyncio.sleep(0.05)
+            assert not engine.health.allow(SITE.key)
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        finally:
+            await engine.aclose()
+
+    asyncio.run(cancel_probe())
+
+    assert engine.health.allow(SITE.key)
+
+
+def test_timeouts_lengthen_the_timeout():
+    tracker = SiteHealthTracker()
+    for _ in range(20):
+        tracker.record_success(SITE.key, 0.5)
+    fast = tracker.timeout_for(SITE.key)
+
+    for _ in range(5):
+        tracker.record_failure(SITE.key, timed_out_after=fast)
+
+    assert tracker.timeout_for(SITE.key) > fast
+
+
+
+def test_quick_scan_timeouts_do_not_trip_deep_scan_breakers():
+    from app.services.site_engine import get_quick_site_check_engine, get_site_check_engine
+
+    quick = get_quick_site_check_engine()
+    for _ in range(quick.health.failure_threshold):
+        quick.health.record_failure(SITE.key, timed_out_after=quick.max_timeout)
+
+    assert not quick.health.allow(SITE.key)
+    assert get_site_check_engine().health.allow(SITE.key)